@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import functools
 import os
 import re
 import subprocess
 import sys
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from string import Template
 from typing import Optional, List, Callable, NamedTuple
@@ -13,12 +14,19 @@ import time
 
 
 import typer
+from typer.models import OptionInfo
 
 ICTRIAGE_MD = "ictriage04.md"
 ICASK_MD = "icask04.md"
 IDEEP_MD = "icdeep02.md"
 SHORT_HASH_LENGTH = 9
 
+# Resolve the user's home-relative directories once per process
+_HOME = Path.home()
+_TMP_DIR = _HOME / "tmp"
+_CACHE_DIR = _HOME / ".cache"
+_CACHE_DIR.mkdir(exist_ok=True)
+
 app = typer.Typer(
     name="alias-cli",
     help="Reusable helpers for zsh aliases (GitHub issue notes, templating, git helpers).",
@@ -52,7 +60,7 @@ def _get_output_dir(filename: str) -> Path:
     Returns:
         Path object for the appropriate output directory
     """
-    base_tmp = Path(os.path.expanduser("~/tmp"))
+    base_tmp = _TMP_DIR
     
     # Check if this is an issue-related file (starts with issue ID pattern)
     # Issue files typically have pattern: {issue_id}-{prefix}-{title}_{timestamp}.md
@@ -64,9 +72,24 @@ def _get_output_dir(filename: str) -> Path:
     tools_dir = base_tmp / "tools"
     return tools_dir
 
+@functools.lru_cache(maxsize=None)
 def _which(name: str) -> bool:
     return any((Path(p) / name).exists() for p in os.environ.get("PATH", "").split(os.pathsep))
 
+# Resolved once per process; PATH lookups for llm are otherwise repeated by every issue command
+_HAS_LLM = _which("llm")
+
+# Resolved once; non-critical progress output skips typer's styling when piped
+_IS_TTY = sys.stdout.isatty()
+
+
+def _info(msg: str, fg: Optional[str] = None) -> None:
+    """Print a non-critical progress message, coloured only when stdout is a TTY."""
+    if _IS_TTY:
+        typer.secho(msg, fg=fg)
+    else:
+        print(msg)
+
 def _run(cmd: list[str], **kw) -> subprocess.CompletedProcess:
     kw.setdefault("check", True)
     kw.setdefault("text", True)
@@ -78,11 +101,7 @@ def _nowstamp() -> str:
     return datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
 
 def _extract_id(url: str) -> str:
-    try:
-        typer.secho(f"🔍 Extracting issue id from: {url}", fg=typer.colors.CYAN)
-    except Exception:
-        # avoid raising if typer isn't available in some contexts
-        pass
+    _info(f"🔍 Extracting issue id from: {url}", fg=typer.colors.CYAN)
     return url.rstrip("/").split("/")[-1]
 
 def _working_tree_clean() -> bool:
@@ -151,7 +170,7 @@ def _git_push() -> None:
 
 
 def _llm(flags: list[str], prompt: str, input_text: Optional[str] = None) -> str:
-    if not _which("llm"):
+    if not _HAS_LLM:
         return ""
     try:
         typer.secho(f"🔍 Running LLM with flags: {flags}", fg=typer.colors.CYAN)
@@ -246,23 +265,41 @@ def _read_from_clipboard() -> str:
         return ""
 
 
-def find_and_remove_old_files(rel_dir: str, *, days: int = 30, pattern: Optional[str] = None, recurse: bool = True) -> int:
+def _iter_files(root: str, recurse: bool = True):
+    """Yield `os.DirEntry` objects for regular files under `root`.
+
+    Uses `os.scandir` so each entry's type and stat information comes from the
+    directory listing instead of a separate `Path` lookup per file.
+    """
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recurse:
+                            yield from _iter_files(entry.path, recurse)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry
+                except OSError:
+                    continue
+    except OSError:
+        return
+
+
+def find_and_remove_old_files(rel_dir: str, *, days: int = 30, pattern: Optional[str] = None, prefixes: Optional[tuple[str, ...]] = None, recurse: bool = True) -> int:
     """Find files under Path.home()/rel_dir matching `pattern` older than `days` and remove them.
 
     Args:
         rel_dir: directory path relative to the user's home directory (e.g., 'tmp')
         days: delete files older than this many days
     pattern: optional regex to match filenames (applied to Path.name)
+    prefixes: optional filename prefixes; a plain `str.startswith` check, cheaper than `pattern`
     recurse: whether to recurse into subdirectories (default True)
 
     Returns:
         Number of files removed (int)
     """
-    
-    import time
-    import re
-
-    base = Path.home() / rel_dir
+    base = _HOME / rel_dir
     if not base.exists():
         return 0
 
@@ -270,22 +307,23 @@ def find_and_remove_old_files(rel_dir: str, *, days: int = 30, pattern: Optional
     filename_re = re.compile(pattern) if pattern else None
 
     removed = 0
-    iterator = base.rglob("*") if recurse else base.iterdir()
-    for p in iterator:
-        if p.is_file():
-            try:
-                if p.stat().st_mtime < cutoff_time:
-                    if filename_re is not None and not filename_re.search(p.name):
-                        continue
-                    try:
-                        p.unlink()
-                    except Exception:
-                        typer.secho(f"⚠️ Failed to delete file: {p}", fg=typer.colors.YELLOW)
-                        # best-effort delete; skip on failure
-                        continue
-                    removed += 1
-            except (OSError, PermissionError):
+    for entry in _iter_files(str(base), recurse):
+        if prefixes and not entry.name.startswith(prefixes):
+            continue
+        try:
+            if entry.stat(follow_symlinks=False).st_mtime >= cutoff_time:
                 continue
+        except OSError:
+            continue
+        if filename_re is not None and not filename_re.search(entry.name):
+            continue
+        try:
+            os.unlink(entry.path)
+        except OSError:
+            typer.secho(f"⚠️ Failed to delete file: {entry.path}", fg=typer.colors.YELLOW)
+            # best-effort delete; skip on failure
+            continue
+        removed += 1
 
     return removed
 
@@ -611,15 +649,29 @@ def _gen_filename(issue_id: str, title_source: str, prefix: str = "note") -> Pat
 # Template helpers
 # -------------------------
 
+_SCRIPT_DIR = Path(__file__).resolve().parent
+# filename -> (mtime, text) for templates read by _read_local_template
+_TPL_CACHE: dict[str, tuple[float, str]] = {}
+
+
 def _read_local_template(filename: str) -> Optional[str]:
     """Read a template file located next to this source file.
 
+    Contents are cached by modification time, so repeat calls only stat the file.
     Returns the file contents if present, otherwise None.
     """
     try:
-        p = Path(__file__).with_name(filename)
-        if p.exists():
-            return p.read_text(encoding="utf-8")
+        p = _SCRIPT_DIR / filename
+        try:
+            mtime = p.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        cached = _TPL_CACHE.get(filename)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        text = p.read_text(encoding="utf-8")
+        _TPL_CACHE[filename] = (mtime, text)
+        return text
     except Exception:
         typer.secho(f"⚠️ Unable to read local template file: {filename}", fg=typer.colors.YELLOW)
         pass
@@ -715,12 +767,39 @@ def _get_start_hash(pattern: str = "UNPICK", match: bool = False, repo: Optional
         return ""
 
 
+@functools.lru_cache(maxsize=16)
+def _compile_template(tpl_text: str) -> tuple[tuple[bool, str, str], ...]:
+    """Split `tpl_text` into (is_var, value, original) parts using string.Template's pattern.
+
+    Cached per template text so repeat renders skip the placeholder scan.
+    """
+    parts: list[tuple[bool, str, str]] = []
+    last = 0
+    for m in Template.pattern.finditer(tpl_text):
+        parts.append((False, tpl_text[last:m.start()], ""))
+        name = m.group("named") or m.group("braced")
+        if name is not None:
+            parts.append((True, name, m.group()))
+        elif m.group("escaped") is not None:
+            parts.append((False, "$", ""))
+        else:
+            parts.append((False, m.group(), ""))
+        last = m.end()
+    parts.append((False, tpl_text[last:], ""))
+    return tuple(parts)
+
+
+def _render_template(tpl_text: str, ctx: dict[str, str]) -> str:
+    """Render `tpl_text` like Template.safe_substitute: unknown placeholders are left as-is."""
+    return "".join(ctx.get(value, original) if is_var else value for is_var, value, original in _compile_template(tpl_text))
+
+
 def _render_and_write(issue_id: str, url: str, prefix: str, tpl_text: str, summary_text: str, ts: str, no_open: bool, editor: Optional[str]) -> Path:
     """Substitute variables into tpl_text, write to generated filename, and open editor unless suppressed.
 
     Returns the output Path.
     """
-    content = Template(tpl_text).safe_substitute(summary=summary_text, url=url, id=issue_id, timestamp=ts)
+    content = _render_template(tpl_text, {"summary": summary_text, "url": url, "id": issue_id, "timestamp": ts})
 
     outpath = _gen_filename(issue_id, f"issue:{url}", prefix)
     outpath.parent.mkdir(parents=True, exist_ok=True)
@@ -745,7 +824,7 @@ def clip_to_commit(
     """
     _ensure_macos_with_pbpaste()
 
-    if not _which("llm"):
+    if not _HAS_LLM:
         typer.secho("❌ 'llm' not found in PATH.", fg=typer.colors.RED)
         raise typer.Exit(1)
 
@@ -952,7 +1031,7 @@ def issue_to_file(
     no_open: bool = typer.Option(False, "--no-open", help="Do not open the file in $EDITOR"),
     editor: Optional[str] = typer.Option(None, "--editor", "-e", help="Editor to open file"),
 ):
-    if not _which("llm"):
+    if not _HAS_LLM:
         typer.secho("❌ 'llm' not found in PATH.", fg=typer.colors.RED)
         raise typer.Exit(1)
     issue_id = _extract_id(url)
@@ -979,7 +1058,7 @@ def clipboard_to_file(
     editor: Optional[str] = typer.Option(None, "--editor", "-e", help="Editor to open file"),
 ):
     _ensure_macos_with_pbpaste()
-    if not _which("llm"):
+    if not _HAS_LLM:
         typer.secho("❌ 'llm' not found in PATH.", fg=typer.colors.RED)
         raise typer.Exit(1)
 
@@ -1789,7 +1868,7 @@ def prettier_toggle_cmd() -> None:
     import shutil
     from pathlib import Path
 
-    home = Path.home()
+    home = _HOME
     file_path = home / "prettier-sql" / ".prettierrc"
     tmp_path = home / "tmp" / ".prettierrc"
 
@@ -1829,7 +1908,7 @@ def chatmodes_copy_cmd(
         typer.secho("❗ Usage: chatmodes_copy <folder_name>", fg=typer.colors.RED)
         raise typer.Exit(1)
 
-    home = Path.home()
+    home = _HOME
     target = home / "GitHub" / folder_name / ".github" / "chatmodes"
     source = home / ".local" / "share" / "chezmoi" / "GitHub" / "datafusion" / "dot_github" / "chatmodes"
 
@@ -2581,7 +2660,7 @@ def _get_template_from_clipboard_or_stdin(prefix: str, pr_number: str) -> str:
         if text:
             # attempt to persist the clipboard content so subsequent runs find the file
             try:
-                p = Path.home() / "tmp" / f"{pr_number}-{prefix}.md"
+                p = _TMP_DIR / f"{pr_number}-{prefix}.md"
                 p.parent.mkdir(parents=True, exist_ok=True)
                 p.write_text(text, encoding="utf-8")
                 typer.secho(f"✅ Saved template to: {p}", fg=typer.colors.GREEN)
@@ -2619,7 +2698,7 @@ def _load_and_fill_template(suffix: str, pr_number: str, copy_hash: bool = False
 
     prefix: 'reviewpr' or 'prwhy' etc.
     """
-    p = Path.home() / "tmp" / f"{pr_number}-{suffix}.md"
+    p = _TMP_DIR / f"{pr_number}-{suffix}.md"
 
     text: Optional[str] = None
     if not p.exists():
@@ -3709,7 +3788,7 @@ def chezadd_cmd(dry_run: bool = typer.Option(False, "--dry-run", help="Show the
 @app.command(name="chezsync")
 def chezsync_cmd(dry_run: bool = typer.Option(False, "--dry-run", help="Show actions without executing them")) -> None:
     """Sync tracked dotfiles with chezmoi: re-add, commit, and push changes in the chezmoi repo."""
-    home = Path.home()
+    home = _HOME
     chez_repo = home / ".local" / "share" / "chezmoi"
 
     if dry_run:
@@ -3978,7 +4057,7 @@ def ideep(
         raise typer.Exit(2)
 
     # Ensure llm is available for generating deep analysis
-    if not _which("llm"):
+    if not _HAS_LLM:
         typer.secho("❌ 'llm' not found in PATH. ideep requires 'llm' to generate the analysis.", fg=typer.colors.RED)
         raise typer.Exit(1)
 
@@ -4064,26 +4143,26 @@ def iprfb(
     The review focuses on consistency, redundancy, and effectiveness of the changes.
     """
     # Warn that this command is deprecated / not used anymore
-    typer.secho("⚠️ 'iprfb' is deprecated and not used anymore. Consider using updated workflows.", fg=typer.colors.YELLOW)
+    _info("⚠️ 'iprfb' is deprecated and not used anymore. Consider using updated workflows.", fg=typer.colors.YELLOW)
 
     # Determine if first argument is a URL or summary text
     is_url = issue.startswith(("http://", "https://"))
     
     # Generate short title for filename
     short_title = "issue-review"
-    if _which("llm"):
+    if _HAS_LLM:
         try:
             title_prompt = "Condense this into a 6–10 word review title (no punctuation). If it's a URL, derive the title from the issue context."
             proc = _run(["llm", "-s", title_prompt], input=issue)
-            if proc.stdout.strip():
-                short_title = proc.stdout.strip()
+            out = proc.stdout.strip()
+            if out:
+                short_title = out
         except Exception:
             typer.secho("⚠️ Failed to generate short title using llm; using fallback.", fg=typer.colors.YELLOW)
             pass
     
     # Fallback title generation if llm failed
     if short_title == "issue-review":
-        import re
         sanitized = re.sub(r"https?://", "", issue)
         sanitized = re.sub(r"[^\w\s-]", "", sanitized)
         sanitized = re.sub(r"\s+", " ", sanitized).strip()
@@ -4126,7 +4205,7 @@ Conclusion:
         issue_to_file(url=issue, prompt=prompt, prefix=prefix, no_open=no_open, editor=editor)
     else:
         # Summary mode: direct LLM execution or output
-        if not _which("llm"):
+        if not _HAS_LLM:
             typer.secho("❌ 'llm' not found in PATH. Outputting prompt instead:", fg=typer.colors.RED)
             typer.echo(prompt)
             return
@@ -4164,11 +4243,12 @@ def icask(
     # Rephrase optional reviewer comment and incorporate if present
     rephrased = ""
     if comment.strip():
-        if _which("llm"):
+        if _HAS_LLM:
             try:
                 rephrase_prompt = "Rephrase this reviewer note in 1–2 concise, professional sentences. Keep key constraints; avoid first person; do not quote verbatim."
                 proc = _run(["llm", "-s", rephrase_prompt], input=comment)
-                rephrased = proc.stdout.strip() if proc.stdout.strip() else comment
+                out = proc.stdout.strip()
+                rephrased = out or comment
             except Exception:
                 typer.secho("⚠️ Failed to rephrase comment using llm; using original.", fg=typer.colors.YELLOW)
                 rephrased = comment
@@ -4259,7 +4339,8 @@ def imuse(
 @app.command(name="cleantmp")
 def cleantmp_cmd(
     days: int = typer.Option(30, "--days", "-d", help="Delete files older than this many days"),
-    pattern: Optional[str] = typer.Option(None, "--pattern", "-p", help="Optional regex pattern to match filenames to delete")
+    pattern: Optional[str] = typer.Option(None, "--pattern", "-p", help="Optional regex pattern to match filenames to delete"),
+    prefixes: Optional[List[str]] = typer.Option(None, "--prefix", help="Only delete files whose names start with this prefix (repeatable)")
 ) -> None:
     """Clean ~/tmp directory by removing old files and empty directories.
     
@@ -4268,40 +4349,33 @@ def cleantmp_cmd(
     2. Removes empty directories (excluding vim_swap and pycache)
     3. Provides feedback on the cleanup process
     """
-    import time
-    
-    tmp_dir = Path.home() / "tmp"
+    tmp_dir = _TMP_DIR
     
     if not tmp_dir.exists():
         typer.secho(f"📁 ~/tmp directory doesn't exist, nothing to clean.", fg=typer.colors.YELLOW)
         return
     
-    typer.secho("🧹 Cleaning ~/tmp...", fg=typer.colors.CYAN)
-    typer.secho(f"🗑️  Deleting files older than {days} days...", fg=typer.colors.CYAN)
-    
-    # Calculate cutoff time (days ago from now)
-    cutoff_time = time.time() - (days * 24 * 60 * 60)
+    _info("🧹 Cleaning ~/tmp...", fg=typer.colors.CYAN)
+    _info(f"🗑️  Deleting files older than {days} days...", fg=typer.colors.CYAN)
     
     # Coerce Typer OptionInfo (or other non-str values) to None when called
     # programmatically so we don't pass a non-string to re.compile.
     if pattern is not None and not isinstance(pattern, str):
-        try:
-            # Typer sometimes passes an OptionInfo object when invoked programmatically;
-            # fall back to treating it as no pattern.
-            from typer.models import OptionInfo  # type: ignore
-            if isinstance(pattern, OptionInfo):
-                pattern = None
-        except Exception:
+        # Typer sometimes passes an OptionInfo object when invoked programmatically;
+        # fall back to treating it as no pattern.
+        if not isinstance(pattern, OptionInfo):
             typer.secho("⚠️  Unexpected pattern type; treating as no pattern.", fg=typer.colors.YELLOW)
-            # Generic fallback: if it's not a str, treat as None
-            pattern = None
+        # Generic fallback: if it's not a str, treat as None
+        pattern = None
+    if isinstance(prefixes, OptionInfo):
+        prefixes = None
 
     # Use reusable helper to remove files
-    files_deleted = find_and_remove_old_files("tmp", days=days, pattern=pattern)
-    typer.secho(f"📄 Deleted {files_deleted} old files", fg=typer.colors.GREEN)
+    files_deleted = find_and_remove_old_files("tmp", days=days, pattern=pattern, prefixes=tuple(prefixes) if prefixes else None)
+    _info(f"📄 Deleted {files_deleted} old files", fg=typer.colors.GREEN)
     
     # Delete empty directories (excluding vim_swap and pycache)
-    typer.secho("📂 Deleting empty folders (excluding vim_swap, tools and pycache)...", fg=typer.colors.CYAN)
+    _info("📂 Deleting empty folders (excluding vim_swap, tools and pycache)...", fg=typer.colors.CYAN)
     
     dirs_deleted = 0
     # Walk directories in reverse order (deepest first) to handle nested empty dirs
@@ -4314,14 +4388,14 @@ def cleantmp_cmd(
             try:
                 # Check if directory is empty
                 if not any(dir_path.iterdir()):
-                    typer.echo(f"Deleting empty dir: {dir_path}")
+                    _info(f"Deleting empty dir: {dir_path}")
                     dir_path.rmdir()
                     dirs_deleted += 1
             except (OSError, PermissionError) as e:
                 typer.secho(f"⚠️  Could not delete {dir_path}: {e}", fg=typer.colors.YELLOW)
     
-    typer.secho(f"📁 Deleted {dirs_deleted} empty directories", fg=typer.colors.GREEN)
-    typer.secho("✅ Cleanup complete!", fg=typer.colors.GREEN)
+    _info(f"📁 Deleted {dirs_deleted} empty directories", fg=typer.colors.GREEN)
+    _info("✅ Cleanup complete!", fg=typer.colors.GREEN)
 
 
 
@@ -4369,11 +4443,8 @@ def weekly_zcompdump_cleaner_cmd() -> None:
 
     Uses `schedule_and_run` to run `clean_old_zcompdump_cmd` every Monday at 07:00.
     """
-    cache_dir = Path.home() / ".cache"
-    cache_dir.mkdir(exist_ok=True)
-
     # Cron expression for Monday at 07:00
-    schedule_and_run("0 7 * * 1", clean_old_zcompdump_cmd, cache_dir=cache_dir)
+    schedule_and_run("0 7 * * 1", clean_old_zcompdump_cmd, cache_dir=_CACHE_DIR)
 
 
 def _run_cleantmp_and_notify() -> None:
@@ -4395,26 +4466,19 @@ def _run_prefixed_cleanup_and_notify(prefixes: List[str] = ["gdiff-", "gdn-", "g
         prefixes: optional list of filename prefixes (e.g. ['gdiff', 'gdn', 'ctest']).
                   If omitted, defaults to ['gdiff', 'gdn', 'ctest'].
 
-    This reuses `cleantmp_cmd` with a filename regex constructed from `prefixes`.
+    This reuses `cleantmp_cmd` with a plain prefix match (`str.startswith`) on filenames.
     """
     # Make a shallow copy to avoid accidental mutation of the default list
     prefixes = list(prefixes) if prefixes is not None else ["gdiff", "gdn", "ctest"]
     DAYS = 1
-    # Build a safe regex that matches names starting with any of the prefixes.
-    # Escape each prefix to avoid regex metacharacters causing surprises.
-    try:
-        safe_parts = [re.escape(p) for p in prefixes if p]
-        if not safe_parts:
-            # nothing to do
-            return
-        pattern = r"^(?:" + "|".join(safe_parts) + ")"
-    except Exception:
-        typer.secho("⚠️  Failed to build regex pattern from prefixes; using fallback pattern.", fg=typer.colors.YELLOW)
-        pattern = r"^(?:gdiff|gdn|ctest)"
+    pfx = [p for p in prefixes if p]
+    if not pfx:
+        # nothing to do
+        return
 
     # Clean files whose names start with the given prefixes older than 2 days
     try:
-        cleantmp_cmd(days=DAYS, pattern=pattern)
+        cleantmp_cmd(days=DAYS, pattern=None, prefixes=pfx)
     except Exception as e:
         typer.secho(f"⚠️  cleanup failed for prefixes={prefixes}: {e}", fg=typer.colors.YELLOW)
         raise
@@ -4428,15 +4492,21 @@ def _run_prefixed_cleanup_and_notify(prefixes: List[str] = ["gdiff-", "gdn-", "g
         typer.secho(f"⚠️  Could not show notification: {e}", fg=typer.colors.YELLOW)
 
 
+def _escape_applescript(s: str) -> str:
+    """Escape backslashes and double quotes for use inside an AppleScript string literal."""
+    return s.replace("\\", "\\\\").replace('"', '\\"')
+
+
 def _notify_macos(message: str, title: str = "Notification") -> None:
     """Show a macOS notification using osascript.
 
     This is a tiny helper to centralize macOS notification logic so it can be
     reused elsewhere in `alias.py`.
     """
+    script = f'display notification "{_escape_applescript(message)}" with title "{_escape_applescript(title)}"'
     try:
         # Use the lightweight _run helper to execute osascript; allow failures silently
-        _run(["osascript", "-e", f'display notification "{message}" with title "{title}"'], check=False)
+        _run(["osascript", "-e", script], check=False)
     except Exception:
         typer.secho("⚠️  Failed to show macOS notification.", fg=typer.colors.YELLOW)
         # swallowing errors is intentional here; callers may log or surface if needed
@@ -4486,12 +4556,10 @@ def schedule_and_run(cron_expr: str, task: Callable[[], None], *, cache_dir: Opt
         task: a zero-argument callable to execute when scheduled
         cache_dir: optional Path to hold the stamp file; defaults to ~/.cache
     """
-    import time
-    from datetime import datetime
-
     if cache_dir is None:
-        cache_dir = Path.home() / ".cache"
-    cache_dir.mkdir(exist_ok=True)
+        cache_dir = _CACHE_DIR
+    elif cache_dir != _CACHE_DIR:
+        cache_dir.mkdir(exist_ok=True)
 
     # Use a deterministic stamp filename derived from the cron expression
     # and the task identity to avoid collisions when multiple different
@@ -4543,13 +4611,10 @@ def _get_last_scheduled_epoch(cron_expr: str, *, now_dt: Optional[datetime] = No
     Uses the same evaluation as `_is_cron_schedule_due` but returns the scheduled epoch so callers
     can take action (and stamp) using that precise time.
     """
-    from datetime import datetime, timedelta
-    import time as _time
-
     if now_dt is None:
         now_dt = datetime.now()
     if now_epoch is None:
-        now_epoch = int(_time.time())
+        now_epoch = int(time.time())
 
     parts = cron_expr.split()
     if len(parts) != 5:
@@ -4563,6 +4628,19 @@ def _get_last_scheduled_epoch(cron_expr: str, *, now_dt: Optional[datetime] = No
     months = _parse_cron_field(month_field, 1, 12)
     weekdays = _parse_cron_field(weekday_field, 0, 6)  # Monday=0
 
+    # Fast path: a single hour and minute (e.g. "0 7 * * 1") pins the time of
+    # day, so only walk back day by day until the date filters match.
+    if len(hours) == 1 and len(minutes) == 1:
+        today = now_dt.replace(hour=next(iter(hours)), minute=next(iter(minutes)), second=0, microsecond=0)
+        for days_back in range(0, 8):
+            candidate = today - timedelta(days=days_back)
+            if candidate.weekday() not in weekdays or candidate.day not in days or candidate.month not in months:
+                continue
+            scheduled_epoch = int(candidate.timestamp())
+            if scheduled_epoch <= now_epoch:
+                return scheduled_epoch
+        return None
+
     candidate = now_dt.replace(second=0, microsecond=0)
     for days_back in range(0, 8):
         day_candidate = candidate - timedelta(days=days_back)
@@ -1,4 +1,5 @@
 import inspect
+import os
 # ##filename=aspect.py, edited on 22 May 2018 Tue 10:30 AM
 # 24-Mar-18 Sat 07:05:01 PM
 #   removed wrapt
@@ -6,6 +7,8 @@ import inspect
 import zd
 import time
 import sys
+import collections
+import itertools
 
 import pprint
 
@@ -15,12 +18,14 @@ LONG_PROCESS_THRESHOLD_SUFFIX = ' !! <== long process !!'
 
 # import functools
 debug = False
-indent = 0
 brief = True
 brief_stop = 280
+# brief and brief_stop folded into one number: the longest trace line
+# printed in full (sys.maxsize when output is not brief)
+_BRIEF_LIMIT = brief_stop
 NOT_SO_BRIEF = 1000
 stack = {}
-COMMON_DEF = ('print_message', 'get_debug_information_message',
+COMMON_DEF = frozenset(('print_message', 'get_debug_information_message',
     'get_computer_name', 'get_script_name', 'sanitize_messages',
     'add_message', 'smart_extend', 'unique_emails',
     'mailing_list_process', 'process_cc', 'get_subject',
@@ -32,7 +37,7 @@ COMMON_DEF = ('print_message', 'get_debug_information_message',
     'caller',
     'get_traceback_lines',
     'get_caller',
-    'islink',)
+    'islink',))
 
 EXCLUDED_CLASSES = ('MIMEMultipart',
   'MIMEText',
@@ -52,14 +57,36 @@ EXCLUDED_CLASS_METHODS = (
   '__repr__',
 )
 
-_ASPECT = True
+# tracing is off unless ASPECT_TRACE=1; enable() turns it on later
+_ASPECT = os.environ.get('ASPECT_TRACE', '0') == '1'
 TRACED_CLASSES = []
-previous_message = False
 _silent_mode = False
+# (obj, name, original, wrapper) for every attribute replaced by a tracing wrapper
+_WRAPPED = []
+# (name, excluded_defs, excluded_classes) for every wrap_module call, so
+# enable() can wrap modules imported while tracing was off
+_MODULES = []
+_wrapped_modules = set()
+
+class _State(object):
+    """ mutable tracing state shared by all wrappers
+
+        wrappers bind this class as a default argument so reads are local;
+        active is False whenever tracing is off or silent
+    """
+    indent = 0
+    previous_message = False
+    active = True
+
+def _update_active():
+    _State.active = _ASPECT and not _silent_mode
+
+_update_active()
 
 def set_silent_mode(mode=True):
     global _silent_mode
     _silent_mode = mode
+    _update_active()
     return _silent_mode
 
 def debug_print(message):
@@ -68,10 +95,24 @@ def debug_print(message):
     if debug:
         print(message)
 
-def f(message, indent=None):
+def flush():
+    """ log the trace lines zd is still holding
+    """
+    zd.flush()
+
+def f(message, indent=None, force=False):
+    """ write message at indent (or the last used indent) through zd.f
+
+        zd formats the line (lap time, indent) now but holds it; held lines
+        are logged when the outermost frame writes at indent 0, when force
+        is True, or by zd itself before any direct zd.f write
+    """
     global _silent_mode
-    if not _silent_mode:
-        zd.f(message, indent)
+    if _silent_mode or not message:
+        return
+    zd.f(message, indent, buffered=True)
+    if force or zd.indent == 0:
+        zd.flush()
 
 class Error (Exception):
     """
@@ -81,18 +122,47 @@ class Error (Exception):
     pass
 
 
+def _register_wrapper(obj, name, wrapper):
+    """ install wrapper as obj.<name>, remembering the original so that
+        set_enabled can swap it back
+    """
+    original = vars(obj).get(name, getattr(obj, name))
+    _WRAPPED.append((obj, name, original, wrapper))
+    setattr(obj, name, wrapper)
+
+def set_enabled(flag=True):
+    """ turn tracing on or off for everything wrapped so far
+
+        disabling restores each wrapped obj.<name> to its original callable,
+        so calls skip the tracing wrapper entirely until re-enabled
+    """
+    global _ASPECT
+    _ASPECT = flag
+    _update_active()
+    for obj, name, original, wrapper in _WRAPPED:
+        setattr(obj, name, wrapper if flag else original)
+    return _ASPECT
+
+def _update_brief_limit():
+    global _BRIEF_LIMIT
+    _BRIEF_LIMIT = brief_stop if brief else sys.maxsize
+
 def set_brief_stop(_brief_stop):
     global brief_stop
     brief_stop = _brief_stop
+    _update_brief_limit()
 
 def set_brief(brief_flag = True):
     global brief
     brief = brief_flag
+    _update_brief_limit()
 
 def wrapfunc(obj, name, processor, avoid_doublewrap=True):
     """ patch obj.<name> so that calling it actually calls, instead,
             processor(original_callable, *args, **kwargs)
     """
+    if not _ASPECT:
+        return
     # get the callable at obj.<name>
     call = getattr(obj, name)
     # optionally avoid multiple identical wrappings
@@ -119,66 +189,58 @@ def wrapfunc(obj, name, processor, avoid_doublewrap=True):
             wrappedfunc = staticmethod(wrappedfunc)
     # finally, install the wrapper closure as requested
     debug_print('setattr {0} {1}'.format(obj, name))
-    setattr(obj, name, wrappedfunc)
+    _register_wrapper(obj, name, wrappedfunc)
+
+def get_r_args(args, kwargs=None, budget=None):
+    """ Returns list of repr(arg) and 'key=repr(value)' strings
 
-def get_r_args(args):
+        once more than budget characters have been rendered the remaining
+        arguments are not repr-ed and '...' is appended instead
+    """
+    r_args = []
+    used = 0
     try:
-        r_args = list(map(repr, args))
+        for key, value in itertools.chain(
+                ((None, arg) for arg in args), (kwargs or {}).items()):
+            if budget is not None and used > budget:
+                r_args.append('...')
+                break
+            r_arg = repr(value) if key is None else '%s=%r' % (key, value)
+            r_args.append(r_arg)
+            used += len(r_arg) + 2
     except Exception as e:
         r_args = [str(e)]
     return r_args
 
-def simple_tracing_processor(obj, call, avoid_doublewrap=True):
-    global COMMON_DEF
+def get_args_budget():
+    """ Returns the number of characters of arguments worth rendering
+    """
+    return _BRIEF_LIMIT
 
+def simple_tracing_processor(obj, call, avoid_doublewrap=True):
     if avoid_doublewrap and getattr(
             call, 'processor', None) is simple_tracing_processor:
         return
 
     original_callable = getattr(call, 'im_func', call)
+    r_name = getattr(call, '__name__', '<unknown>')
 
-    def result(*args, **kwargs):
-        global indent
-        r_name = getattr(call, '__name__', '<unknown>')
-        r_args = get_r_args(args)
-        r_args.extend(['%s=%r' % x for x in kwargs.items()])
-
-        output = "%s{ (%s)" % (r_name, ", ".join(r_args[1:]))
-        _output = get_brief_output(output)
-
-        global previous_message
-        if r_name in COMMON_DEF:
-            message = '..{0}..'.format(r_name)
-            if previous_message and previous_message == message:
-                message = '..'
-            else:
-                previous_message = message
-                f(message)
-        else:
-            f(_output, indent)
-            previous_message = False
-        indent += 1
-
-        try:
-            start = time.time()
-            _result = call(*args, **kwargs)
-            indent -= 1
-        except Error as e:
-            indent -= 1
-            print_duration(start, r_name, indent)
-            f("EXCEPTION in call to %s}" %(r_name,), indent)
-            raise
-        else:
-            if r_name not in COMMON_DEF:
-                print_duration(start, r_name, indent)
-                try:
-                    output = "%s} < result: %s>" %(r_name, repr(_result))
-                except Error as e:
-                    output = "%s} < result: !RESULT NOT STR-able!  >" %(r_name)
-
-                _output = get_brief_output(output)
-                f(_output, indent)
-            return _result
+    # the wrapper only captures what it needs; all tracing logic lives in
+    # the shared module-level _traced / _common_call
+    if r_name in COMMON_DEF:
+        # common defs only ever print '..name..', so give them a wrapper
+        # that never renders args or results
+        common_msg = '..{0}..'.format(r_name)
+        def result(*args, _s=_State, **kwargs):
+            if not _s.active:
+                return call(*args, **kwargs)
+            return _common_call(call, r_name, common_msg, args, kwargs)
+    else:
+        def result(*args, _s=_State, **kwargs):
+            if not _s.active:
+                return call(*args, **kwargs)
+            # args[0] is self, which is not worth rendering
+            return _traced(call, r_name, args, kwargs, 1)
     result.original = call
     result.processor = simple_tracing_processor
     result.class_name = obj.__name__
@@ -188,41 +250,51 @@ def simple_wrapfunc(obj, name, processor, avoid_doublewrap=True):
     """ patch obj.<name> so that calling it actually calls, instead,
             processor(original_callable, *args, **kwargs)
     """
+    if not _ASPECT:
+        return
     call = getattr(obj, name)
 
     debug_print('setattr {0} {1}'.format(obj, name))
     wrapfunc=processor(obj, call, avoid_doublewrap)
 
-    setattr(obj, name, wrapfunc)
+    if wrapfunc is not None:
+        _register_wrapper(obj, name, wrapfunc)
 
 def unwrapfunc(obj, name):
     ''' undo the effects of wrapfunc(obj, name, processor) '''
     setattr(obj, name, getattr(obj, name).original)
 
 
-def all_descendants(class_object, _memo=None):
-    if _memo is None:
-        _memo = {}
-    elif class_object in _memo:
-        return
-    yield class_object
-    for subclass in class_object.__subclasses__():
-        for descendant in all_descendants(subclass, _memo):
-            yield descendant
+def all_descendants(class_object):
+    """ yield class_object and each of its subclasses once, breadth first
+    """
+    seen = set()
+    queue = collections.deque([class_object])
+    while queue:
+        c = queue.popleft()
+        if c in seen:
+            continue
+        seen.add(c)
+        yield c
+        queue.extend(c.__subclasses__())
 
 
 def get_brief_output(output):
-    global brief
-    if output and brief and len(output) > brief_stop:
-        return '{0} ...'.format(output[:brief_stop])
-    return output
+    if len(output) <= _BRIEF_LIMIT:
+        return output
+    return '{0} ...'.format(output[:_BRIEF_LIMIT])
 
 def print_duration(start, def_name, indent,
-        long_process_threshold=LONG_PROCESS_THRESHOLD):
+        long_process_threshold=LONG_PROCESS_THRESHOLD, only_if_long=False):
     """ Returns None
+
+        start is a time.perf_counter_ns() reading; with only_if_long nothing
+        is printed unless the call took longer than long_process_threshold
     """
-    end = time.time()
-    duration = end - start
+    duration_ns = time.perf_counter_ns() - start
+    if only_if_long and duration_ns <= long_process_threshold * 1000000000:
+        return
+    duration = duration_ns / 1e9
 
     if duration > 60:
         duration_string = '%0.3f minutes' % (duration * 1.0/60)
@@ -239,53 +311,82 @@ def print_duration(start, def_name, indent,
         suffix), indent)
 
 
-def tracing_processor(original_callable, *args, **kwargs):
-    global indent
-    global COMMON_DEF
+def common_tracing_processor(original_callable, *args, _s=_State, **kwargs):
+    """ cheap processor for COMMON_DEF functions: prints '..name..' once
+        per run of consecutive calls and never renders args or results
+    """
+    if not _s.active:
+        return original_callable(*args, **kwargs)
 
     r_name = getattr(original_callable, '__name__', '<unknown>')
+    return _common_call(original_callable, r_name, '..{0}..'.format(r_name),
+        args, kwargs)
 
-    r_args = list(map(repr, args))
-#
-    r_args.extend(['%s=%r' % x for x in kwargs.items()])
-    output = "%s{ (%s)" % (r_name, ", ".join(r_args))
-    _output = get_brief_output(output)
 
+def _common_call(original_callable, r_name, message, args, kwargs,
+        _s=_State, _f=f, _perf=time.perf_counter_ns):
+    if _s.previous_message != message:
+        _s.previous_message = message
+        _f(message)
+    _s.indent += 1
+    try:
+        start = _perf()
+        result = original_callable(*args, **kwargs)
+        _s.indent -= 1
+    except Error as e:
+        _s.indent -= 1
+        print_duration(start, r_name, _s.indent, only_if_long=True)
+        _f("EXCEPTION in call to %s}" %(r_name,), _s.indent, force=True)
+        raise
+    return result
 
-    global previous_message
-    if r_name in COMMON_DEF:
-        message = '..{0}..'.format(r_name)
-        if previous_message and previous_message == message:
-            message = '..'
-        else:
-            previous_message = message
-            f(message)
-    else:
-        f(_output, indent)
-        previous_message = False
-    indent += 1
+
+def _traced(original_callable, r_name, args, kwargs, first_arg=0,
+        _s=_State, _f=f, _perf=time.perf_counter_ns):
+    """ call original_callable(*args, **kwargs), tracing its arguments,
+        duration and result; args before first_arg are not rendered
+    """
+    # read once per call, set_brief/set_brief_stop may rebind it
+    limit = _BRIEF_LIMIT
+    r_args = get_r_args(args[first_arg:], kwargs, limit)
+    output = "%s{ (%s)" % (r_name, ", ".join(r_args))
+    if len(output) > limit:
+        output = '{0} ...'.format(output[:limit])
+    _f(output, _s.indent)
+    _s.previous_message = False
+    _s.indent += 1
     try:
-        start = time.time()
+        start = _perf()
         result = original_callable(*args, **kwargs)
-        indent -= 1
+        _s.indent -= 1
     except Error as e:
-        indent -= 1
-        print_duration(start, r_name, indent)
-        f("EXCEPTION in call to %s}" %(r_name,), indent)
+        _s.indent -= 1
+        print_duration(start, r_name, _s.indent)
+        _f("EXCEPTION in call to %s}" %(r_name,), _s.indent, force=True)
         raise
     else:
-        if r_name not in COMMON_DEF:
-            print_duration(start, r_name, indent)
-            try:
-                output = "%s} < result: %s>" %(r_name, repr(result))
-            except Error as e:
-                output = "%s} < result: !RESULT NOT STR-able!  >" %(r_name)
-
-            _output = get_brief_output(output)
-            f(_output, indent)
+        print_duration(start, r_name, _s.indent)
+        try:
+            output = "%s} < result: %s>" %(r_name, repr(result))
+        except Error as e:
+            output = "%s} < result: !RESULT NOT STR-able!  >" %(r_name)
+
+        if len(output) > limit:
+            output = '{0} ...'.format(output[:limit])
+        _f(output, _s.indent)
         return result
 
 
+def tracing_processor(original_callable, *args, _s=_State, **kwargs):
+    if not _s.active:
+        return original_callable(*args, **kwargs)
+
+    r_name = getattr(original_callable, '__name__', '<unknown>')
+    if r_name in COMMON_DEF:
+        return common_tracing_processor(original_callable, *args, **kwargs)
+    return _traced(original_callable, r_name, args, kwargs)
+
+
 
 
 def add_tracing_prints_to_method(class_object, method_name):
@@ -360,34 +461,56 @@ def print_traced_classes():
     print('Aspect traced classes:\n{0}'.format(s))
 
 
+def no_trace(f):
+    """ decorator: mark f so wrap_module leaves it untraced, for small
+        functions called in tight loops
+    """
+    f.__no_trace__ = True
+    return f
+
+
+def _wrap_def(module, def_name, f):
+    processor = (common_tracing_processor if def_name in COMMON_DEF
+        else tracing_processor)
+    wrapper = processedby(processor)(f)
+    wrapper.original = f
+    _register_wrapper(module, def_name, wrapper)
+    debug_print('wrapped def {0}'.format(def_name))
+
+
+def _wrap_module_once(name, excluded_defs, excluded_classes, defs=True,
+        classes=True):
+    """ wrap the functions and classes defined in module name in a single
+        pass over its __dict__
+    """
+    module = sys.modules[name]
+    # snapshot, as wrapping replaces module attributes
+    for member_name, member in list(vars(module).items()):
+        # only members defined in module[name]
+        if getattr(member, '__module__', None) != name:
+            continue
+        if inspect.isfunction(member):
+            if getattr(member, '__no_trace__', False):
+                continue
+            if defs and (not excluded_defs or member not in excluded_defs):
+                _wrap_def(module, member_name, member)
+        elif inspect.isclass(member):
+            if classes and (
+                    not excluded_classes or member not in excluded_classes):
+                add_tracing_prints_to_all_methods(member)
+                debug_print('wrapped class {0}'.format(member_name))
+
+
 def wrap_module_def(name, excluded_defs):
     """
     """
     debug_print('wrap_module_def')
-    module = sys.modules[name]
-    for _name, f in inspect.getmembers(module,
-        # to check that the member isfunction and the class is defined in
-        # module[name]
-        lambda member: inspect.isfunction(member) and member.__module__ == name):
-#         inspect.isfunction):
-        if (excluded_defs and f not in excluded_defs) or (
-            not excluded_defs):
-            setattr(module, _name, processedby(tracing_processor)(f))
-            debug_print('wrapped def {0}'.format(_name))
+    _wrap_module_once(name, excluded_defs, None, classes=False)
 
 
 def wrap_module_class(name, excluded_classes):
     debug_print('wrap_module_class')
-    module = sys.modules[name]
-    for class_name, c in inspect.getmembers(module,
-        # to check that the member isclass and the class is defined in
-        # module[name]
-        lambda member: inspect.isclass(member) and member.__module__ == name):
-#         inspect.isclass):
-        if (excluded_classes and c not in excluded_classes) or (
-            not excluded_classes):
-            add_tracing_prints_to_all_methods(c)
-            debug_print('wrapped class {0}'.format(class_name))
+    _wrap_module_once(name, None, excluded_classes, defs=False)
 
 def wrap_methods( cls):
     def wrapper( fn ):
@@ -414,13 +537,36 @@ def simple_wrap_module_class(name, excluded_classes):
         wrap_methods(c)
         debug_print('wrapped class {0}'.format(class_name))
 
+def _wrap_registered_module(name, excluded_defs, excluded_classes):
+    if name not in _wrapped_modules:
+        _wrapped_modules.add(name)
+        _wrap_module_once(name, excluded_defs, excluded_classes)
+
 def wrap_module(name, excluded_defs = None, excluded_classes = None):
-    global _ASPECT
+    """ trace the defs and classes of module name
+
+        the module is only recorded while tracing is off (the default,
+        unless ASPECT_TRACE=1), and is wrapped if enable() is called later
+    """
+    _MODULES.append((name, excluded_defs, excluded_classes))
     if _ASPECT:
-        wrap_module_def(name, excluded_defs)
-        wrap_module_class(name, excluded_classes)
+        _wrap_registered_module(name, excluded_defs, excluded_classes)
+
+def enable():
+    """ turn tracing on, wrapping every module registered by wrap_module
+        that has not been wrapped yet
+    """
+    set_enabled(True)
+    for name, excluded_defs, excluded_classes in _MODULES:
+        _wrap_registered_module(name, excluded_defs, excluded_classes)
+
+def disable():
+    """ turn tracing off, restoring every wrapped callable to its original
+    """
+    set_enabled(False)
 
 def turn_aspect(flag=True):
     global _ASPECT
     _ASPECT = flag
+    _update_active()
 
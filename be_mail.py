@@ -16,6 +16,7 @@ __license__ = "Python"
 import zd
 import aspect
 import a
+import functools
 import kl_alert
 import bv_me
 
@@ -46,6 +47,17 @@ script: %s
 
 '''
 
+@functools.lru_cache(maxsize=4)
+def _cached_password(from_account):
+    """ Returns the gmail password of from_account, looked up once per account
+
+        call _cached_password.cache_clear() after the password changes
+    """
+    import bv_gmail # import this late
+
+    return bv_gmail.get_password(from_account)
+
+
 class Alert (kl_alert.Alert):
     """
         Alert is a type of kl_alert.Alert
@@ -59,9 +71,7 @@ class Alert (kl_alert.Alert):
         from_account = FROM_ACCOUNT,
         password = None,
         use_default_bcc = False):
-        import bv_gmail # import this late
-
-        password = bv_gmail.get_password(from_account)
+        password = _cached_password(from_account)
         super(Alert, self).__init__(attach_as_zip,
             include_auto_generated_message,
             simulate,
@@ -15,7 +15,9 @@ import zd
 import aspect
 # import a
 import attr
-from bs4 import BeautifulSoup, NavigableString
+from bs4 import BeautifulSoup
+import lxml.etree
+import lxml.html
 import requests
 import collections
 from dataclasses import dataclass
@@ -25,6 +27,19 @@ TagDict = collections.namedtuple('TagDict', 'tag dic')
 
 PARSER = 'lxml'
 
+# seconds
+TIMEOUT = 30
+
+# parses str sources passed to lxml as utf-8 bytes, ignoring any
+# encoding declaration in them
+_UTF8_HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+
+# shared so that repeated fetches reuse pooled (keep-alive) connections
+_SESSION = requests.Session()
+_ADAPTER = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16)
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.mount('https://', _ADAPTER)
+
 class Error (Exception):
     """
         Error is a type of Exception
@@ -41,9 +56,12 @@ class _Soup(BeautifulSoup):
     """A BeautifulSoup
     """
 
-    def init_content(self, content):
+    def init_content(self, content, strainer=None):
+        """ parse content; pass a bs4.SoupStrainer as strainer to build only
+            the matching part of the tree
+        """
         global PARSER
-        super().__init__(content, PARSER)
+        super().__init__(content, PARSER, parse_only=strainer)
         self.content = content
 
     def find_all_tag_dicts(self, tag_dicts):
@@ -68,25 +86,52 @@ class Soup (_Soup):
 
     url = attr.ib(default=None)
     req = attr.ib(default=None)
+    strainer = attr.ib(default=None)
 
 
     def __attrs_post_init__(self):
-        if self.req:
-            req = self.req
-        else:
-            req = requests
         if self.url:
-            r = req.get(self.url)
-            self.init_content(r.content)
+            self.init_content(get_content(self.url, self.req),
+                    self.strainer)
+
+
+def get_content(url, req=None):
+    """ Returns the raw content of url, fetched with req (default: a
+        module-level requests.Session with connection pooling)
+    """
+    if req:
+        r = req.get(url)
+    else:
+        r = _SESSION.get(url, headers={'Accept-Encoding': 'gzip, deflate'},
+                timeout=TIMEOUT)
+    return r.content
 
 
 
 
 def strip_html(src):
-    p = BeautifulSoup(src, 'lxml')
-    text = p.findAll(text=lambda text:isinstance(text, NavigableString))
+    """ Returns the text nodes of html src joined by spaces
 
-    return u" ".join(text)
+        parses with lxml directly, as no BeautifulSoup tree is needed
+        just to collect text
+
+    >>> strip_html('<p>Hello <b>world</b></p>')
+    'Hello  world'
+    >>> strip_html('<?xml version="1.0" encoding="utf-8"?><p>Hello</p>')
+    'Hello'
+    """
+    try:
+        try:
+            tree = lxml.html.fromstring(src)
+        except ValueError:
+            # lxml rejects a str with an encoding declaration; the str is
+            # already decoded, so parse it as utf-8 bytes
+            tree = lxml.html.fromstring(src.encode('utf-8'),
+                    parser=_UTF8_HTML_PARSER)
+    except lxml.etree.ParserError:
+        # empty document
+        return u""
+    return u" ".join(tree.itertext())
 
 
 def _test():
@@ -15,14 +15,28 @@ import zd
 import aspect
 # import a
 import attr
+import concurrent.futures
+import re
 import be_mail
 import bv_beautiful_soup
+import lxml.etree
+import lxml.html
 # import u
 import bv_yaml
 SETTINGS = bv_yaml.load_config()
 
 LIMITS = SETTINGS['limits']
 
+# quote pages fetched concurrently by BloombergUpdate.send_summary_email
+MAX_WORKERS = 8
+
+
+def _has_class(class_name):
+    """ Returns an XPath predicate matching elements with css class class_name
+    """
+    return "contains(concat(' ', normalize-space(@class), ' '), ' {0} ')".format(
+            class_name)
+
 
 class Error (Exception):
     """
@@ -50,7 +64,6 @@ class BloombergQuote (object):
     selector_price_down = '#content > div > div > div.basic-quote > div > div.price-container.down'
 #     selector_price_up = '#content > div > div > div.basic-quote > div > div.price-container.up'
 
-    div = 'div'
     attrs_dict = {
         'price': 'price',
         'currency': 'currency',
@@ -58,74 +71,80 @@ class BloombergQuote (object):
         'cell_label': 'cell__label',
         'cell_value': 'cell__value cell__value_'}
 
+    # XPath equivalents of the selectors above, compiled once
+    _quote = "//*[@id='content']/div/div/div[{0}]/div".format(
+            _has_class('basic-quote'))
+    xpath_name = lxml.etree.XPath(_quote + '/h1')
+    xpath_price_down = lxml.etree.XPath("{0}/div[{1} and {2}]".format(
+            _quote, _has_class('price-container'), _has_class('down')))
+    xpath_price = lxml.etree.XPath('//div[{0}]'.format(
+            _has_class(attrs_dict['price'])))
+    xpath_currency = lxml.etree.XPath('//div[{0}]'.format(
+            _has_class(attrs_dict['currency'])))
+    xpath_change = lxml.etree.XPath('(//div[{0}])[1]//div'.format(
+            _has_class(attrs_dict['change'])))
+    xpath_cell_label = lxml.etree.XPath('//div[{0}]'.format(
+            _has_class(attrs_dict['cell_label'])))
+    xpath_cell_value = lxml.etree.XPath(
+            "//div[normalize-space(@class)='{0}']".format(
+            attrs_dict['cell_value']))
+
     url = attr.ib()
 
     def __attrs_post_init__(self):
         self.triggered = False
         self.get_summary()
 
-    def _get_text(self, _def, *args, **kwargs):
-        """ uses _def to find/select element, then get the text
+    def _get_text(self, xpath, tree):
+        """ uses xpath to find the first matching element, then get the text
 
         Args:
-            _def (a def)
-            *args
-            **kwargs
+            xpath (lxml.etree.XPath)
+            tree (lxml.html.HtmlElement)
 
         Returns:
-            text or None if cannot find/select the element
+            text or None if cannot find the element
 
         """
-        element = _def(*args, **kwargs)
-        if element:
-            try:
-                _element = element[0]
-            except KeyError as ke:
-                _element = element
-            text = _element.text
-            text = text.strip()
-        return text
-
-    def get_label_values(self, soup):
+        elements = xpath(tree)
+        if elements:
+            return elements[0].text_content().strip()
+        return None
+
+    def get_label_values(self, tree):
         """
 
         Args:
-            soup (bv_beautiful_soup.Soup):
+            tree (lxml.html.HtmlElement):
 
         Returns:
             list of (label, value)
 
         """
-        cell_labels = soup.find_all(BloombergQuote.div,
-                attrs=self.get_attrs('cell_label'))
-        cell_values = soup.find_all(BloombergQuote.div,
-                attrs=self.get_attrs('cell_value'))
-        _label_values = zip(cell_labels, cell_values)
+        cell_labels = BloombergQuote.xpath_cell_label(tree)
+        cell_values = BloombergQuote.xpath_cell_value(tree)
         label_values = []
-        for _label_value in _label_values:
-            label = _label_value[0].text
-            value = _label_value[1].text
-            label_values.append((label, value))
+        for label, value in zip(cell_labels, cell_values):
+            label_values.append((label.text_content(),
+                value.text_content()))
 
         return label_values
 
-    def get_change(self, soup):
+    def get_change(self, tree):
         """
 
         Args:
-            soup(bv_beautiful_soup.Soup)
+            tree (lxml.html.HtmlElement):
 
         Returns:
             list of change label, change
 
         """
-        prefix = self.get_prefix(soup)
+        prefix = self.get_prefix(tree)
 
-        change = soup.find(BloombergQuote.div,
-                attrs=self.get_attrs('change'))
         label_values = []
-        for div in change.find_all(BloombergQuote.div):
-            text = div.text
+        for div in BloombergQuote.xpath_change(tree):
+            text = div.text_content()
             if text:
                 text = text.strip()
                 text = f'{prefix}{text}'
@@ -137,18 +156,18 @@ class BloombergQuote (object):
                         BloombergQuote.LABEL_CHANGE, text))
         return label_values
 
-    def get_prefix(self, soup):
+    def get_prefix(self, tree):
         """
 
         Args:
-            soup (bv_beautiful_soup.Soup):
+            tree (lxml.html.HtmlElement):
 
         Returns:
             - if trend is down
             + if trend is up
 
         """
-        price_down = soup.select(BloombergQuote.selector_price_down)
+        price_down = BloombergQuote.xpath_price_down(tree)
         if len(price_down) > 0:
             result = '-'
         else:
@@ -198,21 +217,17 @@ class BloombergQuote (object):
 
         """
         url = self.url
-        soup = bv_beautiful_soup.Soup(url)
-        self.name = self._get_text(soup.select,
-                BloombergQuote.selector_name)
-        self.price = self._get_text(soup.find,
-                BloombergQuote.div,
-                attrs=self.get_attrs('price'))
+        tree = lxml.html.fromstring(bv_beautiful_soup.get_content(url))
+        self.name = self._get_text(BloombergQuote.xpath_name, tree)
+        self.price = self._get_text(BloombergQuote.xpath_price, tree)
         trigger_limit = self.check_trigger_limit(self.name,
                 self.price)
-        self.currency = self._get_text(soup.find,
-                BloombergQuote.div,
-                attrs=self.get_attrs('currency'))
+        self.currency = self._get_text(BloombergQuote.xpath_currency,
+                tree)
 
-        self.label_values = self.get_change(soup)
+        self.label_values = self.get_change(tree)
 
-        label_values = self.get_label_values(soup)
+        label_values = self.get_label_values(tree)
         self.label_values.extend(label_values)
 
         result = ['\n']
@@ -228,22 +243,6 @@ class BloombergQuote (object):
         self.summary = result
         return result
 
-    def get_attrs(self, key, attribute='class'):
-        """
-
-        Args:
-            key (str): a key in attrs_dict
-            attribute(str)
-
-        Returns:
-            the soup find attrs
-
-        """
-        label = BloombergQuote.attrs_dict[key]
-        if label:
-            result = {attribute: label}
-            return result
-
 
 @attr.s
 class BloombergUpdate (object):
@@ -256,12 +255,16 @@ class BloombergUpdate (object):
 
     """
     bloomberg_quote_pattern = 'www.bloomberg.com/quote'
+    bloomberg_quote_re = re.compile(re.escape(bloomberg_quote_pattern),
+            re.IGNORECASE)
     SUBJECT = 'Bloomberg Summary'
     SUBJECT_ALERT = 'Bloomberg Trigger Summary'
     list_of_recipients = attr.ib(default=be_mail.TO, init=True)
 
     def __attrs_post_init__(self):
+        # urls keeps collection order, urls_set makes the duplicate check O(1)
         self.urls = []
+        self.urls_set = set()
 
     def is_bloomberg_quote(self, url):
         """
@@ -273,8 +276,7 @@ class BloombergUpdate (object):
             True if url is bloomberg quote else False
 
         """
-        return url.lower().find(
-                BloombergUpdate.bloomberg_quote_pattern) > -1
+        return BloombergUpdate.bloomberg_quote_re.search(url) is not None
 
     def send_summary_email(self):
         """
@@ -285,15 +287,25 @@ class BloombergUpdate (object):
         """
         aln = be_mail.Alert()
         alt = be_mail.Alert()
-        for url in self.urls:
-            bq = BloombergQuote(url)
-            lines = bq.summary
-            message = '\n'.join(lines)
+        # each quote is an independent fetch + parse, so overlap the fetches
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=MAX_WORKERS) as executor:
+            quotes = list(executor.map(BloombergQuote, self.urls))
+        alert_messages = []
+        normal_messages = []
+        for bq in quotes:
+            message = '\n'.join(bq.summary)
 
             if bq.triggered:
-                alt.add_message(message)
+                alert_messages.append(message)
             else:
-                aln.add_message(message)
+                normal_messages.append(message)
+
+        # one add_message per Alert instead of one per url
+        if alert_messages:
+            alt.add_message('\n\n'.join(alert_messages))
+        if normal_messages:
+            aln.add_message('\n\n'.join(normal_messages))
 
         alt.send_alert_mail(subject=BloombergUpdate.SUBJECT_ALERT)
         aln.send_alert_mail(subject=BloombergUpdate.SUBJECT)
@@ -312,7 +324,8 @@ class BloombergUpdate (object):
 
         """
         if self.is_bloomberg_quote(url):
-            if url not in self.urls:
+            if url not in self.urls_set:
+                self.urls_set.add(url)
                 self.urls.append(url)
             return True
         return False
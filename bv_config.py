@@ -15,6 +15,7 @@ __license__ = "Python"
 
 # import ast
 import configparser
+import io
 import os
 
 import aspect
@@ -27,7 +28,11 @@ ENCODING = "utf-8"
 STATUS = "status"
 LAST_RUN_DATE = "last_run_date"
 
-INI_PATHS = (".", os.environ["PYTHON_SOURCE"])
+INI_PATHS = (".", os.path.abspath(os.environ["PYTHON_SOURCE"]))
+
+# (working directory, config_file) -> resolved path_file, filled by
+# resolve_config_path
+_resolved_paths = {}
 
 NoOptionError = configparser.NoOptionError
 NoSectionError = configparser.NoSectionError
@@ -46,19 +51,15 @@ class Config(object):
         _config_file = self.assert_config_file_exists(config_file)
         if _config_file:
             self.config_file = _config_file
-            self.cf = False
-            self.cf = self.read_config()
+            # (section, item) -> raw value, cleared whenever a value is set
+            self._values = {}
+            self.read_config()
         else:
             raise Exception("cannot find {0} in {1}".format(config_file, INI_PATHS))
 
     def assert_config_file_exists(self, config_file):
         """Returns path_file of config_file if can find config_file in INI_PATHS"""
-        for p in INI_PATHS:
-            pf = os.path.join(p, config_file)
-            if bv_file.exists(pf):
-                return pf
-
-        return False
+        return resolve_config_path(config_file)
 
     def get_items(self, section):
         items = []
@@ -69,22 +70,28 @@ class Config(object):
 
     def get(self, section, item, raw=True, return_eval=False):
 
+        key = (section, item)
         try:
-            result = self.cf.get(section, item, raw=True)
-        except NoOptionError as e:
-            raise e
+            result = self._values[key]
+        except KeyError:
+            try:
+                result = self.cf.get(section, item, raw=True)
+            except NoOptionError as e:
+                raise e
+            self._values[key] = result
 
         if return_eval:
             return eval(result)
         return result
 
     def read_config(self):
-        if not self.cf:
+        """Returns self.cf, parsing config_file only the first time"""
+        cf = getattr(self, "cf", False)
+        if not cf:
             cf = configparser.ConfigParser(interpolation=None)
             cf.read(self.config_file, self.encoding)
-            return cf
-        else:
-            return self.cf
+            self.cf = cf
+        return cf
 
     def toggle(self, section, item):
         """ """
@@ -96,8 +103,8 @@ class Config(object):
 
     def update_config(self, section, item, value, write_to_file=False):
         """Returns None"""
-        self.cf = self.read_config()
         self.cf.set(section, item, value)
+        self._values.clear()
 
         if write_to_file:
             self.update_config_file()
@@ -109,9 +116,17 @@ class Config(object):
         return None
 
     def update_config_file(self):
-        """Returns None"""
-        with open(self.config_file, "w") as f:
-            self.cf.write(f)
+        """Returns None
+
+        Renders the whole config in memory, writes it to a temporary file
+        in one call and moves it over config_file.
+        """
+        buffer = io.StringIO()
+        self.cf.write(buffer)
+        tmp_file = "{0}.tmp".format(self.config_file)
+        with open(tmp_file, "w", encoding=self.encoding) as f:
+            f.write(buffer.getvalue())
+        os.replace(tmp_file, self.config_file)
 
         return None
 
@@ -119,6 +134,27 @@ class Config(object):
 ##aspect.add_tracing_prints_to_all_methods(Config)
 
 
+def resolve_config_path(config_file, cache=_resolved_paths):
+    """Returns path_file of config_file in INI_PATHS, or False if not found
+
+    Found paths are remembered, so later Config instances for the same
+    file skip the INI_PATHS walk. INI_PATHS starts with ".", so they are
+    remembered per working directory.
+    """
+    key = (os.getcwd(), config_file)
+    try:
+        return cache[key]
+    except KeyError:
+        pass
+    for p in INI_PATHS:
+        pf = os.path.join(p, config_file)
+        if bv_file.exists(pf):
+            pf = cache[key] = os.path.abspath(pf)
+            return pf
+
+    return False
+
+
 ##@aspect.processedby(aspect.tracing_processor)
 def get_last_run_date(config):
     """Returns last run date"""
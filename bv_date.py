@@ -12,13 +12,18 @@ __license__ = "Python"
 import sys
 import zd
 
-import dateutil.parser, time, datetime, calendar
+import dateutil.parser, datetime, calendar
 import dateutil.relativedelta
 import aspect
 import u
 import dateutil
+import functools
+import itertools
+import math
+import numbers
 import re
 import a
+import numpy as np
 
 # import these
 import bv_fire
@@ -39,6 +44,11 @@ quarter_end_dates = {
     'q4': '31-DEC'
     }
 
+_NON_DIGIT = re.compile(r'\D')
+
+# datetime64[D] counts days from 1-jan-1970
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
 WEEKDAYS = [
   'MONDAY',
   'TUESDAY',
@@ -49,6 +59,22 @@ WEEKDAYS = [
   'SUNDAY'
 ]
 
+# month names by (short, uppercase) as month_string returns them, eg
+# _MONTH_STRINGS[(True, True)][1] == 'FEB'
+_MONTH_STRINGS = {}
+for _short in (True, False):
+    _names = tuple(datetime.date(1900, m, 1).strftime('%b' if _short else '%B')
+        for m in range(1, 13))
+    _MONTH_STRINGS[(_short, False)] = _names
+    _MONTH_STRINGS[(_short, True)] = tuple(n.upper() for n in _names)
+del _short, _names
+
+# weekday index by the first two letters of its name, in every mix of case
+# ('mo', 'Mo', 'mO', 'MO') so lookups need no .upper()
+_WEEKDAY_PREFIX = {''.join(prefix): i
+    for i, weekday in enumerate(WEEKDAYS)
+    for prefix in itertools.product(*((c, c.lower()) for c in weekday[:2]))}
+
 
 class Error (Exception):
     """
@@ -103,9 +129,9 @@ def quarter_start_end_dates(year_quarter):
     quarter_position = year_quarter.find('q')
     quarter = year_quarter[quarter_position:quarter_position+2]
     year = year_quarter.replace(quarter, '')
-    year = re.sub('\D', '', year) #remove non-numbers
-    start_date = '{0}-{1}'.format(quarter_start_dates[quarter], year)
-    end_date = '{0}-{1}'.format(quarter_end_dates[quarter], year)
+    year = _NON_DIGIT.sub('', year) #remove non-numbers
+    start_date = f'{quarter_start_dates[quarter]}-{year}'
+    end_date = f'{quarter_end_dates[quarter]}-{year}'
     return parse_date(start_date), parse_date(end_date)
 
 ##@aspect.processedby(aspect.tracing_processor)
@@ -148,10 +174,10 @@ def month_name(month_num):
     'May'
 
     '''
-    zd.f('month_name+')
-    result = datetime.date(1900,month_num,1).strftime('%B')
+    if not 1 <= month_num <= 12:
+        raise ValueError('month must be in 1..12')
+    result = _MONTH_STRINGS[(False, False)][month_num - 1]
 
-    zd.f('month_name-')
     return result
 
 
@@ -187,19 +213,14 @@ def oracle_date(d, include_time = False, dayfirst = None,
     '''
     if d is None:
         return None
-    if type(d) not in (datetime.date, datetime.datetime):
+    if not isinstance(d, datetime.date):
         d = parse_date(d, dayfirst=dayfirst, fuzzy = False)
-        return oracle_date(d)
-    else:
-        pattern = '%d-%b-%Y'
-        if include_time:
-            time_pattern = '%H:%M:%S'
-            pattern = '{0} {1}'.format(pattern, time_pattern)
-        result = d.strftime(pattern)
-        if trim_leading_zero:
-            if result.startswith('0'):
-                result = result[1:]
-        return result
+    pattern = '%d-%b-%Y %H:%M:%S' if include_time else '%d-%b-%Y'
+    result = d.strftime(pattern)
+    if trim_leading_zero:
+        if result.startswith('0'):
+            result = result[1:]
+    return result
 
 ##@aspect.processedby(aspect.tracing_processor)
 def is_even_month(t = None):
@@ -209,7 +230,7 @@ def is_even_month(t = None):
     if not t:
         t = u.today()
 
-    result = int(t.strftime('%m')) % 2 == 0
+    result = t.month % 2 == 0
     return result
 
 ##@aspect.processedby(aspect.tracing_processor)
@@ -232,9 +253,8 @@ def mssql_date(d):
     '''
     if d is None:
         return d
-    if type(d) not in (datetime.date, datetime.datetime):
+    if not isinstance(d, datetime.date):
         d = parse_date(d)
-        return mssql_date(d)
 
     return d.strftime('%Y-%m-%d')
 
@@ -295,9 +315,97 @@ def fuzzy_guess_date(a_date, anchor = None):
     return a_date
 
 
-def parse_date(date, print_to_stdout=False, fuzzy = True,
+# formats tried with strptime before falling back to dateutil, in order;
+# numeric fields follow dateutil's dayfirst handling (which also reads
+# '2012-12-01' as 12-jan-2012)
+_FAST_FORMATS = ('%d-%b-%Y', '%Y-%m-%d', '%m-%d-%Y', '%d-%b-%y')
+_FAST_FORMATS_DAYFIRST = ('%d-%b-%Y', '%d-%m-%Y', '%d-%b-%y')
+
+
+def _dateutil_year(year, today):
+    """ Returns two-digit year resolved the way dateutil does, ie to
+        within 50 years of today
+    """
+    year += today.year // 100 * 100
+    if year >= today.year + 50:
+        year -= 100
+    elif year < today.year - 50:
+        year += 100
+    return year
+
+
+def _strptime(date, dayfirst, today):
+    """ Returns datetime of date if it is in one of the _FAST_FORMATS,
+        else None
+    """
+    for fmt in _FAST_FORMATS_DAYFIRST if dayfirst else _FAST_FORMATS:
+        try:
+            result = datetime.datetime.strptime(date, fmt)
+        except ValueError:
+            continue
+        if fmt.endswith('%y'):
+            result = result.replace(
+                year=_dateutil_year(result.year % 100, today))
+        return result
+    return None
+
+
+# dateutil errors that a fuzzy parse (which skips unknown tokens) may get
+# past; invalid values such as 'month must be in 1..12' fail fuzzy too
+_FUZZY_WORTHY = re.compile(r'unknown|extra|could not', re.IGNORECASE)
+
+
+def _retry_fuzzy(fuzzy, error):
+    """ Returns True if a sharp parse that raised error should be retried
+        fuzzy; fuzzy is True, False or 'auto'
+    """
+    if fuzzy == 'auto':
+        return _FUZZY_WORTHY.search(str(error)) is not None
+    return bool(fuzzy)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_str(date, dayfirst, fuzzy, today):
+    """ Returns (parsed datetime, 'Sharp' or 'Fuzzy') for string date
+
+        today is part of the cache key: dateutil fills in missing
+        fields (eg the day of 'feb 2013') from the current date
+    """
+    result = _strptime(date, dayfirst, today)
+    if result is not None:
+        return result, 'Sharp'
+    try:
+        return dateutil.parser.parse(date, dayfirst=dayfirst), 'Sharp'
+    except ValueError as e:
+        if not _retry_fuzzy(fuzzy, e):
+            raise
+        return (dateutil.parser.parse(date, fuzzy=True, dayfirst=dayfirst),
+            'Fuzzy')
+
+
+def _is_all_numbers(date):
+    """ Returns True if date is a number or a string of an integer
+        ie what int(date) accepts, without raising and catching
+    """
+    if isinstance(date, str):
+        digits = date.strip()
+        if digits[:1] in ('+', '-'):
+            digits = digits[1:]
+        return digits.replace('_', '').isdecimal()
+    if isinstance(date, float):
+        # int() rejects nan and inf
+        return math.isfinite(date)
+    return isinstance(date, numbers.Number) and not isinstance(date, complex)
+
+
+def parse_date(date, print_to_stdout=False, fuzzy = 'auto',
     dayfirst = None, return_datetime_as_date = False, **kwargs):
     """returns a date from a variable that resembles a date
+
+       fuzzy is True, False or 'auto': retry a failed sharp parse with
+       fuzzy (skipping unknown tokens) always, never, or only when the
+       failure was about unknown tokens
+
        >>> d = 'Jan 3 2006'
        >>> parse_date(d, True)
        Sharp 'Jan 3 2006' -> 2006-01-03 00:00:00
@@ -326,18 +434,16 @@ def parse_date(date, print_to_stdout=False, fuzzy = True,
     # dateutil.parser needs a string argument: let's make one from our
     # `date' argument, according to a few reasonable conventions...:
 
-    date_is_integer = False
-    try:
-        i = int(date)
-    except Exception as e:
-        pass
-    else:
+    if _is_all_numbers(date):
         message = 'it is all numbers!'
         raise ParseDateError(date, message)
 
 
     if isinstance(date, (tuple, list)):
-        date = ' '.join([str(x) for x in date])    # join up sequences
+        if len(date) == 3:                         # (day, month, year)
+            date = f'{date[0]} {date[1]} {date[2]}'
+        else:
+            date = ' '.join([str(x) for x in date])    # join up sequences
     elif isinstance(date, int):
         date = str(date)                           # stringify integers
     elif isinstance(date, dict):
@@ -349,22 +455,34 @@ def parse_date(date, print_to_stdout=False, fuzzy = True,
             print(message)
 
     try:
-        try:
-            if isinstance(date, datetime.datetime):
-                if return_datetime_as_date:
-                    parsedate = date.date()
-                else:
-                    parsedate = date
-            elif isinstance(date, datetime.date):
-                parsedate = date
+        if isinstance(date, datetime.datetime):
+            if return_datetime_as_date:
+                parsedate = date.date()
             else:
-                parsedate = dateutil.parser.parse(date, dayfirst=dayfirst, **kwargs)
-                if return_datetime_as_date:
-                    parsedate = parse_date(parsedate, return_datetime_as_date = return_datetime_as_date)
+                parsedate = date
             bprint('Sharp %r -> %s' % (date, parsedate))
-        except ValueError:
-            parsedate = dateutil.parser.parse(date, fuzzy=fuzzy, dayfirst = dayfirst, **kwargs)
-            bprint('Fuzzy %r -> %s' % (date, parsedate))
+        elif isinstance(date, datetime.date):
+            parsedate = date
+            bprint('Sharp %r -> %s' % (date, parsedate))
+        elif kwargs:
+            # extra dateutil options are not cached
+            try:
+                parsedate = dateutil.parser.parse(date, dayfirst=dayfirst, **kwargs)
+                how = 'Sharp'
+            except ValueError as e:
+                if not _retry_fuzzy(fuzzy, e):
+                    raise
+                parsedate = dateutil.parser.parse(date, fuzzy=True, dayfirst = dayfirst, **kwargs)
+                how = 'Fuzzy'
+            if return_datetime_as_date:
+                parsedate = parsedate.date()
+            bprint('%s %r -> %s' % (how, date, parsedate))
+        else:
+            parsedate, how = _parse_str(date, dayfirst, fuzzy,
+                datetime.date.today())
+            if return_datetime_as_date:
+                parsedate = parsedate.date()
+            bprint('%s %r -> %s' % (how, date, parsedate))
     except Exception as err:
         error_message = str(err)
         # Exception: Try as I may, I cannot parse 'feb 2013' (day is out of range for mont h)
@@ -378,6 +496,19 @@ def parse_date(date, print_to_stdout=False, fuzzy = True,
 
     return parsedate
 
+
+def parse_date_many(dates, **kwargs):
+    """ Returns [parse_date(d, **kwargs) for d in dates], parsing each
+        distinct (hashable) value of dates only once
+
+       >>> parse_date_many(['1-jan-08', '2-jan-08', '1-jan-08'])
+       [datetime.datetime(2008, 1, 1, 0, 0), datetime.datetime(2008, 1, 2, 0, 0), datetime.datetime(2008, 1, 1, 0, 0)]
+
+    """
+    dates = list(dates)
+    parsed = {d: parse_date(d, **kwargs) for d in dict.fromkeys(dates)}
+    return [parsed[d] for d in dates]
+
 def get_weekday_index(weekday):
     ''' Returns None
 
@@ -387,25 +518,7 @@ def get_weekday_index(weekday):
     3
 
     '''
-    zd.f('get_weekday_index+')
-    weekday_prefix = weekday[:2].upper()
-
-    if weekday_prefix == 'MO':
-        result = 0
-    elif weekday_prefix == 'TU':
-        result = 1
-    elif weekday_prefix == 'WE':
-        result = 2
-    elif weekday_prefix == 'TH':
-        result = 3
-    elif weekday_prefix == 'FR':
-        result = 4
-    elif weekday_prefix == 'SA':
-        result = 5
-    elif weekday_prefix == 'SU':
-        result = 6
-    zd.f('get_weekday_index-')
-    return result
+    return _WEEKDAY_PREFIX[weekday[:2]]
 
 
 
@@ -419,24 +532,33 @@ def get_weekdays_of_month(year, month, day):
     Returns:
         generator of dates of month
     '''
-    c = calendar.Calendar(firstweekday=calendar.SUNDAY)
-
     years = u.ensure_iterable(year)
     months = u.ensure_iterable(month)
-    days = u.ensure_iterable(day)
+    days = list(u.ensure_iterable(day))
 
     for _year in years:
         for _month in months:
-            d = datetime.date(_year, _month, 1)
-            d_weekday = d.weekday()
+            first_weekday_index, month_days = calendar.monthrange(_year, _month)
+            first_ordinal = datetime.date(_year, _month, 1).toordinal()
+            for ordinal in _weekday_ordinals_of_month(first_ordinal,
+                    month_days, first_weekday_index, days):
+                yield datetime.date.fromordinal(ordinal)
+
 
-            while d.month == _month:
-                for _day in days:
-                    diff = _day - d_weekday
-                    result = u.adddays(diff, d)
-                    if result.month == _month:
-                        yield result
-                d = u.adddays(7, d)
+def _weekday_ordinals_of_month(first_ordinal, month_days, first_weekday_index,
+        days):
+    ''' Returns list of ordinals of weekday indexes days in the month
+        starting at first_ordinal, week by week in the order of days
+    '''
+    last_ordinal = first_ordinal + month_days - 1
+    result = []
+    for week_ordinal in range(first_ordinal - first_weekday_index,
+            last_ordinal + 1, 7):
+        for _day in days:
+            ordinal = week_ordinal + _day
+            if first_ordinal <= ordinal <= last_ordinal:
+                result.append(ordinal)
+    return result
 
 
 
@@ -447,22 +569,28 @@ def nth_weekday_of_month(n, a_date, weekday):
     >>> nth_weekday_of_month(2, '1-dec-07', 'thursday')
     datetime.datetime(2007, 12, 13, 0, 0)
     '''
-    result = None
-#     zd.f('nth_weekday_of_month+')
-# #
     day_index = get_weekday_index(weekday)
-    r = dateutil.relativedelta.relativedelta(day=1, weekday=day_index)
     a_date = parse_date(a_date)
-#
-    first_weekday_of_month = a_date + r
-    result = first_weekday_of_month
-    if n > 1:
-        r = dateutil.relativedelta.relativedelta(weekday=day_index, days=+1)
-        for i in range(1, n):
-            result = result + r
-#
-#     zd.f('nth_weekday_of_month+')
-    return result
+    first_of_month = a_date.replace(day=1)
+    days = _nth_weekday_offset(n, first_of_month.weekday(), day_index)
+    return first_of_month + datetime.timedelta(days=days)
+
+
+def _nth_weekday_offset(n, first_weekday_index, weekday_index):
+    ''' Returns days from the first of a month, which falls on
+        first_weekday_index, to its nth weekday_index (n < 1 counts as 1)
+    '''
+    return (weekday_index - first_weekday_index) % 7 + 7 * max(n - 1, 0)
+
+
+def _count_nday_ord(start_ordinal, end_ordinal, start_weekday_index,
+        nday_index):
+    ''' Returns number of days of weekday nday_index between ordinals
+        start_ordinal and end_ordinal inclusive
+    '''
+    first_nday_ordinal = start_ordinal + (
+        nday_index - start_weekday_index) % 7
+    return (end_ordinal - first_nday_ordinal) // 7 + 1
 
 
 def get_exception_dates(weekday, frequency_in_month, start_date, end_date):
@@ -481,30 +609,28 @@ def get_exception_dates(weekday, frequency_in_month, start_date, end_date):
     [datetime.datetime(2007, 12, 13, 0, 0), datetime.datetime(2007, 12, 27, 0, 0), datetime.datetime(2008, 1, 10, 0, 0)]
 
     '''
-    result = []
-    zd.f('get_exception_dates+')
-#
     weekday_index = get_weekday_index(weekday)
-#
-    first_weekday_of_start_month = nth_weekday_of_month(1, start_date, weekday)
-#
-    r = dateutil.relativedelta.relativedelta(days=-1)
-    a_date = first_weekday_of_start_month + r
-    r = dateutil.relativedelta.relativedelta(days=+1, weekday = weekday_index)
-    i = 0
     start_date = parse_date(start_date)
     end_date = parse_date(end_date)
-    while a_date <= end_date:
-        old_month = a_date.month
-        a_date = a_date + r
-        i += 1
-        new_month = a_date.month
-        if new_month != old_month:
-            i = 1
-        if i not in frequency_in_month and a_date <= end_date and a_date >= start_date:
-            result.append(a_date)
-#
-    zd.f('get_exception_dates-')
+
+    start_ordinal = start_date.toordinal()
+    first_ordinal = start_ordinal + (weekday_index - start_date.weekday()) % 7
+    end_ordinal = end_date.toordinal()
+    if start_date + datetime.timedelta(days=end_ordinal - start_ordinal) > end_date:
+        # end_date is earlier in the day than start_date
+        end_ordinal -= 1
+
+    # every weekday between start_date and end_date, as datetime64[D]
+    days = np.arange(first_ordinal - _EPOCH_ORDINAL,
+        end_ordinal - _EPOCH_ORDINAL + 1, 7, dtype=np.int64)
+    dates = days.astype('datetime64[D]')
+    day_of_month = (dates - dates.astype('datetime64[M]')).astype(np.int64) + 1
+    nth_in_month = (day_of_month - 1) // 7 + 1
+    days = days[~np.isin(nth_in_month, list(frequency_in_month))]
+
+    offset = _EPOCH_ORDINAL - start_ordinal
+    result = [start_date + datetime.timedelta(days=int(d) + offset)
+        for d in days]
     return result
 
 
@@ -517,7 +643,6 @@ def print_exception_dates(weekday, frequency_in_month, start_date, end_date):
     '2007-12-13', '2007-12-27'
 
     '''
-    zd.f('print_exception_dates+')
     exception_dates = get_exception_dates(weekday, frequency_in_month, start_date, end_date)
     str_exception_dates = []
     for d in exception_dates:
@@ -526,7 +651,6 @@ def print_exception_dates(weekday, frequency_in_month, start_date, end_date):
     string = ', '.join(str_exception_dates)
 
     sys.stdout.write('%s\n' % string)
-    zd.f('print_exception_dates-')
     return None
 
 ##@aspect.processedby(aspect.tracing_processor)
@@ -561,22 +685,9 @@ def count_nday_in_date_range(start_date, end_date, nday):
 
     a.assert_true(end_date >= start_date,
         'end_date is earlier than start_date')
-    u.ensure_end_date_is_later(start_date, end_date)
-    days_between = u.days_between(start_date, end_date)
-    start_date_day_index = start_date.weekday()
-    nday_index = get_weekday_index(nday)
-
-    start_date_ordinal = start_date.toordinal()
-    end_date_ordinal = end_date.toordinal()
 
-    if nday_index >= start_date_day_index:
-        first_nday_ordinal = start_date_ordinal + (nday_index - start_date_day_index)
-    else:
-        first_nday_ordinal = start_date_ordinal + (6 + nday_index - start_date_day_index)
-
-    week_count = (end_date_ordinal - first_nday_ordinal)/7 + 1
-
-    return week_count
+    return _count_nday_ord(start_date.toordinal(), end_date.toordinal(),
+        start_date.weekday(), get_weekday_index(nday))
 
 ##@aspect.processedby(aspect.tracing_processor)
 def first_day_of_month(a_date = None):
@@ -587,17 +698,13 @@ def first_day_of_month(a_date = None):
     #what is the first day of the current month
     a_date = u.today() if a_date is None else a_date
     a_date = parse_date(a_date)
-    ddays = int(a_date.strftime("%d"))-1 #days to subtract to get to the 1st
-    delta = datetime.timedelta(days= ddays)  #create a delta datetime object
-    result = a_date - delta                #Subtract delta and return
-    return datetime.date(result.year, result.month, result.day)
+    return datetime.date(a_date.year, a_date.month, 1)
 
 ##@aspect.processedby(aspect.tracing_processor)
 def make_date_time(dateString,strFormat="%Y-%m-%d"):
     # Expects "YYYY-MM-DD" string
     # returns a datetime object
-    eSeconds = time.mktime(time.strptime(dateString,strFormat))
-    return datetime.datetime.fromtimestamp(eSeconds)
+    return datetime.datetime.strptime(dateString, strFormat)
 
 
 ##@aspect.processedby(aspect.tracing_processor)
@@ -670,14 +777,10 @@ def month_string(d, short = True, uppercase = True):
     ''' Returns month string of a date
           eg FEB, MAR ..
     '''
-    format = '%b' if short else '%B'
-    try:
-        m = d.strftime(format)
-        m = m.upper() if uppercase else m
-    except AttributeError as e:
-        return month_string(parse_date(d), short, uppercase)
+    if not isinstance(d, datetime.date):
+        d = parse_date(d)
 
-    return m
+    return _MONTH_STRINGS[(bool(short), bool(uppercase))][d.month - 1]
 
 
 ##@aspect.processedby(aspect.tracing_processor)
@@ -708,8 +811,7 @@ def day_diff(date1, date2):
     """
     d1 = parse_date(date1, return_datetime_as_date = True)
     d2 = parse_date(date2, return_datetime_as_date = True)
-    result = (d1 - d2).days
-    return result
+    return d1.toordinal() - d2.toordinal()
 
 ##@aspect.processedby(aspect.tracing_processor)
 def week_diff(date1, date2):
@@ -738,14 +840,14 @@ def month_range(start_month, end_month, month_format = '%b-%Y'):
     start_date = min(date1, date2)
     end_date = max(date1, date2)
 
-    less_than_end = True
-    i = 0
-    while less_than_end:
-        d = start_date + dateutil.relativedelta.relativedelta(months = i)
-        yield d.strftime(month_format).upper()
-        i += 1
-        new_d = start_date + dateutil.relativedelta.relativedelta(months = i)
-        less_than_end = new_d <= end_date
+    y, m = start_date.year, start_date.month
+    end_y, end_m = end_date.year, end_date.month
+    while (y, m) <= (end_y, end_m):
+        yield start_date.replace(year=y, month=m).strftime(month_format).upper()
+        m += 1
+        if m == 13:
+            m = 1
+            y += 1
 
 def year_range(start_year, end_year):
     """returns a generator of years
@@ -791,7 +893,6 @@ def date_range(date1, date2, return_generator = True):
     [datetime.datetime(2008, 7, 1, 0, 0), datetime.datetime(2008, 7, 2, 0, 0)]
 
     '''
-    zd.f('date_range+')
     date1 = parse_date(date1)
     date2 = parse_date(date2)
 
@@ -799,13 +900,35 @@ def date_range(date1, date2, return_generator = True):
     end_date = max(date1, date2)
 
     r = (end_date+datetime.timedelta(days=1) - start_date).days
-    zd.f('date_range-')
     g = (start_date + datetime.timedelta(days=i) for i in range(r))
     if return_generator:
         return g
     else:
         return list(g)
 
+def date_range_array(date1, date2):
+    ''' Returns a numpy datetime64[D] array of the dates between
+        date1, date2, built without a python object per day
+
+        use .tolist() for datetime.date objects
+
+    -- doctests ----
+
+    >>> date_range_array('3-jul-08', '1-jul-08')
+    array(['2008-07-01', '2008-07-02', '2008-07-03'], dtype='datetime64[D]')
+
+    '''
+    date1 = parse_date(date1)
+    date2 = parse_date(date2)
+
+    start_date = min(date1, date2)
+    end_date = max(date1, date2)
+
+    r = (end_date+datetime.timedelta(days=1) - start_date).days
+    start = start_date.toordinal() - _EPOCH_ORDINAL
+    return np.arange(start, start + r, dtype=np.int64).astype(
+        'datetime64[D]')
+
 ##@aspect.processedby(aspect.tracing_processor)
 def month_quarter(d):
     ''' Returns the calendar quarter of date d
@@ -825,7 +948,8 @@ def datetime_of(a_date):
     ''' Returns None
 
     '''
-    if type(a_date) in (datetime.datetime,):
+    if isinstance(a_date, datetime.date):
+        # parse_date returns dates and datetimes unchanged
         result = a_date
     else:
         result = parse_date(a_date)
@@ -837,9 +961,8 @@ def is_last_day_of_month(a_date):
     ''' Returns True if a_date is last day of the month
     '''
 
-    ld = last_day_of_month(a_date)
     d = parse_date(a_date)
-    return d.year == ld.year and d.month == ld.month and d.day == ld.day
+    return (d + datetime.timedelta(days=1)).month != d.month
 
 ##@aspect.processedby(aspect.tracing_processor)
 def is_odd_day(t = None):
@@ -851,16 +974,13 @@ def is_odd_day(t = None):
     else:
         t = parse_date(t)
 
-    d = t.day
-    return u.is_odd_number(d)
+    return t.day % 2 == 1
 
 ##@aspect.processedby(aspect.tracing_processor)
 def current_year():
     """ Returns current year
     """
-    now = u.now()
-    result = int(now.strftime('%Y'))
-    return result
+    return u.now().year
 
 ##@aspect.processedby(aspect.tracing_processor)
 def get_normalized_quarter_date_ranges(qr):
@@ -870,24 +990,16 @@ def get_normalized_quarter_date_ranges(qr):
         normalize is remove dates where the current value does not
         change from earlier value
     '''
-    dd = {}
-    previous_v = None
-
-    for k, v in list(qr.items()):
+    dd = {quarter_start_end_dates(k)[0]: v for k, v in qr.items()}
 
-        start_date, end_date = quarter_start_end_dates(k)
-        dd[start_date] = v
+    result = {}
+    previous_v = object()
+    for a_date, v in sorted(dd.items(), key=lambda item: item[0]):
+        if v != previous_v:
+            result[a_date] = v
+            previous_v = v
 
-    dates = list(dd.keys())
-    dates.sort()
-    for a_date in dates:
-        v = dd.get(a_date)
-        if v == previous_v:
-            del dd[a_date]
-
-        previous_v = v
-
-    return dd
+    return result
 
 ##@aspect.processedby(aspect.tracing_processor)
 def is_month(month_string):
@@ -1065,9 +1177,9 @@ def _test():
     >>> quarter_start_end_dates('q1-2009')
     (datetime.datetime(2009, 1, 1, 0, 0), datetime.datetime(2009, 3, 31, 0, 0))
     >>> get_normalized_quarter_date_ranges({'q12009' : 10, 'q22009': 20, 'q32009': 20})
-    {datetime.datetime(2009, 4, 1, 0, 0): 20, datetime.datetime(2009, 1, 1, 0, 0): 10}
+    {datetime.datetime(2009, 1, 1, 0, 0): 10, datetime.datetime(2009, 4, 1, 0, 0): 20}
     >>> get_normalized_quarter_date_ranges({'q12009' : 10, 'q22009': 10, 'q32009': 20})
-    {datetime.datetime(2009, 7, 1, 0, 0): 20, datetime.datetime(2009, 1, 1, 0, 0): 10}
+    {datetime.datetime(2009, 1, 1, 0, 0): 10, datetime.datetime(2009, 7, 1, 0, 0): 20}
 
     >>> t = is_month('JUL-10')
     >>> t != None
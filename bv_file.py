@@ -19,8 +19,38 @@ import bv_subprocess
 import os
 import shutil
 import re
+import collections
+import concurrent.futures
 import csv
+import datetime
 import json
+import time
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# bytes read and written at a time by FileLinesMarker
+CHUNK_SIZE = 1 << 20
+
+# files stat'ed and copied concurrently by DateFileCopier.do
+MAX_WORKERS = 8
+
+def _parse_date(d):
+    """ Returns d as a datetime, parsing ISO 8601 strings with
+        datetime.fromisoformat and anything else with bv_date.parse_date
+    """
+    if isinstance(d, datetime.datetime):
+        return d
+    if isinstance(d, str):
+        s = d.strip()
+        # yyyy-..., so all-digit strings still reach bv_date's checks
+        if s[4:5] == '-':
+            try:
+                return datetime.datetime.fromisoformat(s)
+            except ValueError:
+                pass
+    return bv_date.parse_date(d)
 
 @attr.s
 class FileLinesMarker (object):
@@ -48,20 +78,39 @@ class FileLinesMarker (object):
         self.temp_file = os.path.join(p, _f)
         self.marker_string = str(self.marker_string)
 
-    def do(self):
+    def mark_lines(self, lines):
+        """ Returns lines (without line ends) joined, each marked and
+            ended with a new line
         """
+        if not lines:
+            return ''
+        suffix = self.marker_string + '\n'
+        if self.marker_position:
+            position = self.marker_position
+            return ''.join([line.ljust(position) + suffix for line in lines])
+        return suffix.join(lines) + suffix
 
-        """
+    def do(self):
+        """ marks path_file a CHUNK_SIZE block at a time
 
-        with open(self.temp_file, 'w') as out_file:
-            with open(self.path_file, 'r') as in_file:
-                for line in in_file:
-                    _line = line.rstrip('\n')
-                    _line = _line.rstrip('\r')
-                    if self.marker_position:
-                        _line = _line.ljust(self.marker_position)
+        """
 
-                    out_file.write(_line + self.marker_string + '\n')
+        with open(self.temp_file, 'w', encoding='utf-8',
+                buffering=CHUNK_SIZE) as out_file:
+            with open(self.path_file, 'r', encoding='utf-8',
+                    buffering=CHUNK_SIZE) as in_file:
+                # universal newlines: \r\n and \r are read as \n
+                carry = ''
+                while True:
+                    chunk = in_file.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    lines = (carry + chunk).split('\n')
+                    # the last piece may be a partial line
+                    carry = lines.pop()
+                    out_file.write(self.mark_lines(lines))
+                if carry:
+                    out_file.write(self.mark_lines([carry]))
 
         rename_file(self.temp_file, self.path_file)
 
@@ -70,6 +119,13 @@ class FileLinesMarker (object):
 #     if value >= self._y:
 #         raise ValueError("'x' has to be smaller than 'y'!")
 
+def _dotted_extension(extension):
+    """ Returns extension with a leading '.', eg 'txt' -> '.txt'
+    """
+    if extension and not extension.startswith('.'):
+        return '.' + extension
+    return extension
+
 @attr.s
 class FileExtensionChanger:
 
@@ -81,13 +137,12 @@ class FileExtensionChanger:
     to_extension = attr.ib()
 
     def __attrs_post_init__(self):
-        pass
+        self.to_extension = _dotted_extension(self.to_extension)
 
     def get_new_path_file(self):
-        p, f, e = get_path_file_extension_tuple(self.path_file)
-        fe = f'{f}{self.to_extension}'
-        new_path_file = os.path.join(p, fe)
-        return new_path_file
+        # swap the extension in place, without splitting off the folder
+        root, e = os.path.splitext(self.path_file)
+        return root + self.to_extension
 
     def do(self):
         """
@@ -121,15 +176,13 @@ class FilesAddFix:
         """
 
         """
-        p, f, e = get_path_file_extension_tuple(path_file)
+        p, fe = os.path.split(path_file)
+        f, e = os.path.splitext(fe)
         if self.prefix:
-            f = f'{self.fix}{f}'
+            fe = self.fix + f + e
         else:
-            f = f'{f}{self.fix}'
-
-        fe = f'{f}{e}'
-        result = os.path.join(p, fe)
-        return result
+            fe = f + self.fix + e
+        return os.path.join(p, fe)
 
     def add_fix(self, path_file):
         """
@@ -157,7 +210,7 @@ class FilesExtensionChanger:
     to_extension = attr.ib()
 
     def __attrs_post_init__(self):
-        pass
+        self.to_extension = _dotted_extension(self.to_extension)
 
     def do(self):
         ff = FolderFiles(self.folder, patterns=self.pattern,
@@ -188,95 +241,209 @@ class DateFileCopier (object):
             self.extensions = ['']
         if not self.dates:
             self.dates = [u.now()]
-        self.dates = list(map(bv_date.parse_date, self.dates))
+        self.dates = list(map(_parse_date, self.dates))
+        # dates by day, so do() matches a file's mtime with one lookup
+        self._dates_by_day = {}
+        for date in self.dates:
+            self._dates_by_day.setdefault(date.date(), []).append(date)
         strip = lambda a : a.strip()
 
         self.from_folders = list(map(strip, self.from_folders))
         self.to_folders = list(map(strip, self.to_folders))
         self.extensions = list(map(strip, self.extensions))
+        extensions = {e.lstrip('.') for e in self.extensions}
+        # None matches any extension
+        self._extension_re = None if '' in extensions else re.compile(
+                r'\.(?:{0})$'.format('|'.join(map(re.escape, extensions))),
+                re.IGNORECASE)
 
     def get_from_files(self):
         """
             returns a generator of files in from_folders with
-            extension
+            extension (any extension if extensions has '')
         """
+        extension_re = self._extension_re
         for from_folder in self.from_folders:
-            for extension in self.extensions:
-                glob_pattern = r'{0}\*.{1}'.format(from_folder, extension)
-                files = glob.iglob(glob_pattern)
-                for file in files:
-                    yield file
+            with os.scandir(from_folder) as entries:
+                for entry in entries:
+                    name = entry.name
+                    # like glob, skip hidden files
+                    if name.startswith('.'):
+                        continue
+                    if not (extension_re is None or
+                            extension_re.search(name)):
+                        continue
+                    if entry.is_file(follow_symlinks=False):
+                        yield entry.path
 
     def ensure_folder_exists(self, folder):
         """
         """
-        if not exists(folder):
-            mkdir(folder)
+        # exist_ok, as worker threads may create the same date folder
+        os.makedirs(folder, exist_ok=True)
 
     def copy(self, file, to_folders, date):
         """
         """
-        i = 0
+        _to_folders = []
         for to_folder in to_folders:
             _to_folder = to_folder
             if self.to_folder_date_format:
                 date_folder_name = date.strftime(self.to_folder_date_format)
                 _to_folder = os.path.join(to_folder, date_folder_name)
             self.ensure_folder_exists(_to_folder)
+            _to_folders.append(_to_folder)
+
+        copy_to_folders(file, _to_folders)
+        return len(_to_folders)
 
-            copy(file, _to_folder)
-            p, f = get_path_file_tuple(file)
-            i += 1
+    def process_file(self, file):
+        """ copies file if it was last modified on one of dates
 
-        return i
+            Returns:
+                list of copied file names, list of failed files
+        """
+        copied_files = []
+        failed_files = []
+        try:
+            file_last_modified_date = get_file_last_modified_time(
+                file).date()
+        except Exception as e:
+            failed_files.append(file)
+            return copied_files, failed_files
+        for date in self._dates_by_day.get(file_last_modified_date, ()):
+            try:
+                self.copy(file, self.to_folders, date)
+                p, f = get_path_file_tuple(file)
+                copied_files.append(f)
+            except Exception as e:
+                failed_files.append(file)
+        return copied_files, failed_files
+
+    def process_files(self, files):
+        """ process_file each of files in turn
+
+            Returns:
+                list of copied file names, list of failed files
+        """
+        copied_files = []
+        failed_files = []
+        for file in files:
+            _copied_files, _failed_files = self.process_file(file)
+            copied_files.extend(_copied_files)
+            failed_files.extend(_failed_files)
+        return copied_files, failed_files
 
     def do(self):
         """
         """
         self.init()
-        i = 0
+        files = list(self.get_from_files())
+        if len(files) * len(self.to_folders) < MAX_WORKERS:
+            results = list(map(self.process_file, files))
+        else:
+            # files with the same name are copied to the same to_path_file,
+            # so one worker copies them in order and the last one wins
+            files_by_name = {}
+            for file in files:
+                files_by_name.setdefault(
+                    os.path.basename(file), []).append(file)
+            # stat + copy is I/O bound, so overlap it across files
+            with concurrent.futures.ThreadPoolExecutor(
+                    max_workers=MAX_WORKERS) as executor:
+                results = list(executor.map(self.process_files,
+                                            files_by_name.values()))
+
         copied_files = []
         failed_files = []
-        for file in self.get_from_files():
-            for date in self.dates:
-                try:
-                    ok = False
-                    file_last_modified_time = get_file_last_modified_time(
-                        file)
-                    if file_last_modified_time.date() == date.date():
-                        self.copy(file, self.to_folders, date)
-                        p, f = get_path_file_tuple(file)
-                        copied_files.append(f)
-                        i += 1
-                except Exception as e:
-                    failed_files.append(file)
+        for _copied_files, _failed_files in results:
+            copied_files.extend(_copied_files)
+            failed_files.extend(_failed_files)
 
         self.copied_files = sorted(copied_files)
         self.failed_files = sorted(failed_files)
-        return i
+        return len(copied_files)
+
+def _copy_range(src, dst, size):
+    """ copy up to size bytes from the start of file object src to dst,
+        inside the kernel with os.copy_file_range
+
+        Returns the number of bytes copied, which is less than size if
+        copy_file_range stopped early
+    """
+    offset = 0
+    while offset < size:
+        n = os.copy_file_range(src.fileno(), dst.fileno(),
+            size - offset, offset, offset)
+        if n == 0:
+            break
+        offset += n
+    return offset
+
+def copy_to_folders(path_file, folders):
+    """ copy path_file into each of folders (like shutil.copy),
+        opening path_file only once
+    """
+    name = os.path.basename(path_file)
+    with open(path_file, 'rb') as src:
+        size = os.fstat(src.fileno()).st_size
+        for folder in folders:
+            to_path_file = os.path.join(folder, name)
+            # opening to_path_file with 'wb' would empty path_file itself
+            if (os.path.exists(to_path_file) and
+                    os.path.samefile(path_file, to_path_file)):
+                raise shutil.SameFileError(
+                    f'{path_file} and {to_path_file} are the same file')
+            copied = None
+            if hasattr(os, 'copy_file_range'):
+                try:
+                    with open(to_path_file, 'wb') as dst:
+                        copied = _copy_range(src, dst, size)
+                except OSError:
+                    # eg across file systems on older kernels
+                    copied = None
+            if copied != size:
+                # no copy_file_range, it failed, or it stopped short
+                shutil.copyfile(path_file, to_path_file)
+            shutil.copymode(path_file, to_path_file)
 
 def is_link(path_file):
     """ Returns True if path_file is a symbolic link
     """
-    return Path(path_file).is_symlink()
+    # one lstat, without building a Path; False if path_file is missing
+    return os.path.islink(path_file)
 
 def get_subdirectories(root, subdirectory_name):
-    for root, dirs, subdirs in os.walk(root):
-        for d in dirs:
-            if d == subdirectory_name:
-                yield root, d
+    """ Yields (folder, subdirectory_name) for each directory named
+        subdirectory_name under root
+
+        does not descend into the matches, nor into symbolic links
+    """
+    folders = [root]
+    while folders:
+        folder = folders.pop()
+        try:
+            # read the whole folder first, as callers may remove matches
+            entries = list(os.scandir(folder))
+        except OSError:
+            continue
+        for entry in entries:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            if entry.name == subdirectory_name:
+                yield folder, entry.name
+            else:
+                folders.append(entry.path)
 
 def delete_subdirectories(root, subdirectory_name):
     '''
         useful for deleting node_modules in source directory to
         reduce files synchronized
     '''
-    for root, dirs, subdirs in os.walk(root):
-        for d in dirs:
-            if d == subdirectory_name:
-                _d = os.path.join(root, d)
-                shutil.rmtree(_d)
-                print(f'deleted {_d}')
+    for root, subdirectory in get_subdirectories(root, subdirectory_name):
+        _d = os.path.join(root, subdirectory)
+        shutil.rmtree(_d)
+        print(f'deleted {_d}')
 
 def symlink_subdirectories(root, subdirectory_name,
                            move_to_root):
@@ -313,9 +480,16 @@ def delete_old_directories(directories, pattern = None,
 
     l = []
     f = []
+    # one clock read for the whole run, then a stat + compare per directory
+    cutoff_time = time.time() - old_threshold_days * 24 * 60 * 60
     for directory in directories:
         for d in get_dir_items(directory, yield_directories = True):
-            if get_days_since_last_modified(d) > old_threshold_days:
+            try:
+                is_old = os.stat(d).st_mtime < cutoff_time
+            except OSError as e:
+                f.append('{0} - {1}'.format(d, e))
+                continue
+            if is_old:
                 try:
                     if not test and not is_link(d):
                         os.rmdir(d)
@@ -344,6 +518,9 @@ def get_p_glob_files(p, pattern):
 def get_re_match(re, a_string):
     return re.match(a_string)
 
+# name (n).ext of a duplicate file, eg automatewoo (1).zip
+_DUP_RE = re.compile(r'(?P<pre>.+?)\s*\(\d+\)(?P<post>\.[^()]+)$')
+
 def get_duplicate_files(folder):
     '''
         get duplicate files in folder
@@ -351,35 +528,26 @@ def get_duplicate_files(folder):
         automatewoo (1).zip
     '''
     p = Path(expanduser(folder))
-    files = get_p_glob_files(p, '*(*)*')
-    RE = re.compile('(?P<pre>.+)(\(\d+\))(?P<post>\..+)')
+    files = list(get_p_glob_files(p, '*'))
 
-    duplicate_parts = []
-    for i, f in enumerate(files):
-        m = get_re_match(RE, f.name)
+    # one pass: group the numbered copies by (pre, post)
+    groups = collections.defaultdict(list)
+    for f in files:
+        m = _DUP_RE.match(f.name)
         if m:
-            pre = m.group('pre').strip()
-            post = m.group('post')
-            t = (pre, post)
-            if t not in duplicate_parts:
-                result = []
-                def append_result(files, test_m=True):
-                    for _file in files:
-                        m = RE.match(_file.name)
-                        if m or not test_m:
-                            result.append(_file)
-
-                _files = get_p_glob_files(p, f'{pre}*{post}')
-                append_result(_files)
-                _files = get_p_glob_files(p, f'{pre}{post}')
-                append_result(_files, test_m=False)
-
-                if len(result) > 1:
-                    duplicate_parts.append(t)
-                    yield result
+            groups[(m.group('pre').strip(), m.group('post'))].append(f)
+
+    files_by_name = {f.name: f for f in files}
+    for (pre, post), result in groups.items():
+        original = files_by_name.get(f'{pre}{post}')
+        if original is not None:
+            result.append(original)
+        if len(result) > 1:
+            yield result
 
 def get_files_sorted_by_mtime(files):
-    return sorted(files, key=os.path.getmtime)
+    # sorted calls key once per file; read st_mtime from a single os.stat
+    return sorted(files, key=lambda f: os.stat(f).st_mtime)
 
 def delete_duplicate_sync_files(folder, mark_for_delete=True):
     '''
@@ -433,23 +601,36 @@ def delete_duplicate_sync_files(folder, mark_for_delete=True):
 # Takes the file paths as arguments
 def make_json(csvFilePath, jsonFilePath):
 
-    # create a dictionary
-    paths = []
-    # Open a csv reader called DictReader
-    with open(csvFilePath, encoding='utf-8') as csvf:
-        csvReader = csv.DictReader(csvf)
-        # Convert each row into a dictionary
-        # and add it to data
-        for row in csvReader:
-            row['arg'] = row['url']
-            row['variables'] = {'url': row['url']}
-            paths.append(row)
-
-    data = {'items': paths}
-    # Open a json writer, and use the json.dumps()
-    # function to dump data
-    with open(jsonFilePath, 'w', encoding='utf-8') as jsonf:
-        jsonf.write(json.dumps(data, indent=4))
+    # orjson serialises in C; otherwise compact json.dumps. DictReader
+    # keys the extra fields of a long row with None, which both write
+    # as "null"
+    if orjson is not None:
+        dumps = lambda o: orjson.dumps(o, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        dumps = lambda o: json.dumps(o, separators=(',', ':')).encode('utf-8')
+
+    # write {"items": [...]} a row at a time rather than holding every
+    # row in memory, into a temp file so an error leaves jsonFilePath
+    # untouched
+    temp_file = f'{jsonFilePath}_tmp'
+    try:
+        with open(csvFilePath, encoding='utf-8') as csvf, \
+                open(temp_file, 'wb') as jsonf:
+            csvReader = csv.DictReader(csvf)
+            jsonf.write(b'{"items":[')
+            separator = b''
+            for row in csvReader:
+                url = row['url']
+                jsonf.write(separator)
+                jsonf.write(dumps({**row, 'arg': url,
+                                   'variables': {'url': url}}))
+                separator = b','
+            jsonf.write(b']}')
+    except BaseException:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+    os.replace(temp_file, jsonFilePath)
 
 
 @bv_time.print_timing
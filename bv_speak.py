@@ -50,16 +50,32 @@ class Robot:
     # cantonese voice 38
 
     def __init__(self):
-        self.engine = self.get_engine()
-        try:
-            self.voices = self.get_voices()
-            self.set_voice_index(Robot.DEFAULT_VOICE_INDEX)
-        except Exception as e:
-            self.voices = []
-            zd.p('Using default voice')
+        # the pyttsx3 engine is only started on first use, see engine
+        self._engine = None
+        self.voices = []
+        self._voice_ids = []
+
+    @property
+    def engine(self):
+        """ Returns the pyttsx3 engine, starting it on first use
+        """
+        if self._engine is None:
+            self._engine = self.get_engine()
+            try:
+                self.voices = self.get_voices()
+                self._voice_ids = [voice.id for voice in self.voices]
+            except (RuntimeError, OSError) as e:
+                # the driver could not list its voices
+                self.voices = []
+                self._voice_ids = []
+            if Robot.DEFAULT_VOICE_INDEX < len(self._voice_ids):
+                self.set_voice_index(Robot.DEFAULT_VOICE_INDEX)
+            else:
+                zd.p('Using default voice')
+        return self._engine
 
     def get_voices(self):
-        voices = engine.getProperty('voices')
+        voices = self.engine.getProperty('voices')
         return voices
 
 
@@ -76,17 +92,18 @@ class Robot:
         self.engine.setProperty('voice', voice_id)
 
     def list_voices(self):
-        for i in range(9):
-            try:
-                description = self.engine.GetVoices().Item(i).GetDescription()
-                print(i, description)
-            except Exception as e:
-                pass
+        self.engine # voices are loaded with the engine
+        for i, voice in enumerate(self.voices):
+            # pyttsx3 voices always have a name, but it can be None
+            print(i, voice.name or voice.id)
 
     def get_voice_id(self, voice_index):
-        for i, voice in enumerate(self.voices):
-            if i == voice_index:
-                return voice.id
+        """ Returns id of voice number voice_index, or 0 if there is none
+        """
+        self.engine # voices are loaded with the engine
+        voice_ids = self._voice_ids
+        if 0 <= voice_index < len(voice_ids):
+            return voice_ids[voice_index]
         return 0
 
     def get_engine(self, rate=RATE, volume=VOLUME):
@@ -96,25 +113,40 @@ class Robot:
     def test_voices(self):
         """
         """
+        global MUTE
+        if MUTE:
+            return
+        self.engine # voices are loaded with the engine
         for i, voice in enumerate(self.voices):
             self.engine.setProperty('voice', voice.id)
             self._say(f'Number {i}.  This is a test')
 
     def _say(self, text, print_say=PRINT_SAY):
         global MUTE
-        if not MUTE:
+        # printing alone never needs the engine
+        speak = not MUTE and text
+        if speak:
             self.engine.say(text)
         if print_say:
             print(text)
-        if not MUTE:
+        if speak:
             self.engine.runAndWait()
 
     def say(self, text, print_say=PRINT_SAY):
         count = 0
         if isinstance(text, (list, tuple)):
+            # queue every utterance, then wait on the engine once
+            global MUTE
+            spoken = False
             for _text in text:
-                self._say(_text, print_say)
+                if not MUTE and _text:
+                    self.engine.say(_text)
+                    spoken = True
+                if print_say:
+                    print(_text)
                 count += 1
+            if spoken:
+                self.engine.runAndWait()
         else:
             self._say(text, print_say)
             count = 1
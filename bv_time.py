@@ -20,19 +20,28 @@ import time
 # must not import bv_date because bv_date import bv_error and it will import
 #   bv_time
 # import bv_date
-import bv_stack
 import datetime
 import u
 import a
+import os
 import sys
 import textwrap
+import functools
 from _base import Timer, get_lap_seconds
 
 timer = False
 suppress_print = False
 last_timestamp = None
+# second (time.time()) and text of the timestamp last formatted by
+#   get_timestamped_message
+_last_ts_second = None
+_last_ts_str = ''
 STAR = ' *'
 MAX_STAR_MESSAGE_LENGTH = 75
+# modules skipped when looking for the script that called print_running_message
+_IGNORED_CALLERS = frozenset(('bv_time', 'aspect'))
+# blanks out the rest of the line after print_timing's message
+_PAD80 = ' ' * 80
 
 
 
@@ -87,9 +96,9 @@ def print_timing(func):
             number = minutes * 60
             unit = 'seconds'
 
-        message = '\n%s completed in %0.3f %s' % (func_name, number, unit)
+        message = f'\n{func_name} completed in {number:0.3f} {unit}'
 
-        sys.stdout.write("\r" + message + ' ' * 80 + "\r")
+        sys.stdout.write(f'\r{message}{_PAD80}\r')
         sys.stdout.flush()
 
         return res
@@ -100,41 +109,53 @@ def print_timing(func):
 def print_running_message():
     """ Returns running message
     """
-    s = bv_stack.Stack()
-    script_name = s.caller()
+    # walk the frames directly instead of building a bv_stack.Stack
+    frame = sys._getframe(1)
+    script_name = ''
+    while frame is not None:
+        name = os.path.splitext(os.path.basename(frame.f_code.co_filename))[0]
+        if name not in _IGNORED_CALLERS:
+            script_name = name
+            break
+        frame = frame.f_back
 
     message = '{0} running..'.format(script_name)
 
     return print_message(message)
 
 ##@aspect.processedby(aspect.tracing_processor)
+@aspect.no_trace
 def get_timestamp():
     """ Returns timestamp for this second
     """
-    _result = time.strftime('%H%M%S')
-    result = '{0}_{1}'.format(get_datestamp(), _result)
-    return result
+    # one localtime for both halves; numeric fields need no strftime
+    t = time.localtime()
+    return (f'{t.tm_year:04d}{t.tm_mon:02d}{t.tm_mday:02d}_'
+        f'{t.tm_hour:02d}{t.tm_min:02d}{t.tm_sec:02d}')
 
 ##@aspect.processedby(aspect.tracing_processor)
+@aspect.no_trace
 def get_datestamp(date=None):
     """ Returns date stamp
     """
-    pattern = '%Y%m%d'
     if date is None:
-        result = time.strftime(pattern)
+        t = time.localtime()
+        result = f'{t.tm_year:04d}{t.tm_mon:02d}{t.tm_mday:02d}'
     else:
-        result = u.today().strftime(pattern)
+        result = date.strftime('%Y%m%d')
     return result
 
 ##@aspect.processedby(aspect.tracing_processor)
+@aspect.no_trace
 def get_datetime_stamp(date = None):
     """
     """
-    pattern = '%Y%m%d %H%M%S'
     if date is None:
-        result = time.strftime(pattern)
+        t = time.localtime()
+        result = (f'{t.tm_year:04d}{t.tm_mon:02d}{t.tm_mday:02d} '
+            f'{t.tm_hour:02d}{t.tm_min:02d}{t.tm_sec:02d}')
     else:
-        result = u.today().strftime(pattern)
+        result = date.strftime('%Y%m%d %H%M%S')
     return result
 
 def _get_starred_message_old(message):
@@ -152,11 +173,8 @@ def _get_starred_message_old(message):
     star = STAR
     _message = '{0} {1} '.format(star, message)
     message_length = len(_message)
-    even_message_length = message_length % 2 == 0
-    if even_message_length:
-        star_count = message_length/2 + 1
-    else:
-        star_count = (message_length + 1)/2
+    # length/2 + 1 if even, (length + 1)/2 if odd
+    star_count = (message_length + 2) // 2
 
     prefix = star * star_count
     end_star = prefix[message_length:]
@@ -165,6 +183,8 @@ def _get_starred_message_old(message):
         end_star, suffix)
     return result
 
+# cached, as it depends only on its arguments (and STAR)
+@functools.lru_cache(maxsize=512)
 def _get_starred_line(line, length, prefix):
     global STAR
     star = STAR
@@ -183,6 +203,8 @@ def get_starred_lines(_lines, line_length, prefix):
         lines.append(line)
     return lines
 
+# cached, as it depends only on message (and STAR, MAX_STAR_MESSAGE_LENGTH)
+@functools.lru_cache(maxsize=512)
 def get_starred_message(message):
     """
         Returns a starred message
@@ -208,13 +230,8 @@ def get_starred_message(message):
         line_length = len(_line)
         _lines = [message]
 
-    even_message_length = line_length % 2 == 0
-    if even_message_length:
-        star_count = line_length/2 + 1
-    else:
-        star_count = (line_length + 1)/2
-
-    star_count = int(star_count)
+    # line_length/2 + 1 if even, (line_length + 1)/2 if odd
+    star_count = (line_length + 2) // 2
     prefix = star * star_count
     end_star = prefix[line_length:]
     suffix = prefix
@@ -228,19 +245,27 @@ def get_starred_message(message):
     return result
 
 ##@aspect.processedby(aspect.tracing_processor)
+@aspect.no_trace
 def get_timestamped_message(message):
     """
     """
     global last_timestamp
-
-    timestamp = time.strftime("%a, %d %b %Y %H:%M:%S")
+    global _last_ts_second
+    global _last_ts_str
+
+    # strftime at most once a second
+    now = int(time.time())
+    if now != _last_ts_second:
+        _last_ts_second = now
+        _last_ts_str = time.strftime("%a, %d %b %Y %H:%M:%S",
+            time.localtime(now))
+    timestamp = _last_ts_str
     result = message
     if last_timestamp != timestamp:
         last_timestamp = timestamp
-        _timestamp = 'TIMESTAMP: {0}'.format(timestamp)
-        _timestamp = get_starred_message(_timestamp)
+        _timestamp = get_starred_message(f'TIMESTAMP: {timestamp}')
 
-        result = '{0}{1}'.format(_timestamp, result)
+        result = f'{_timestamp}{result}'
 
     return result, timestamp
 
@@ -274,12 +299,14 @@ def print_message(message, with_time_stamp = True, starred = False):
         return timestamp
 
 
+@aspect.no_trace
 def assert_datelike(dt):
     a.assert_true(isinstance(dt, (datetime.datetime, datetime.date)),
                     f'{dt} is not date or datetime')
 
 
 ##@aspect.processedby(aspect.tracing_processor)
+@aspect.no_trace
 def add_hours(hours, dt = None):
     """Returns dt + hours
     """
@@ -293,6 +320,7 @@ def add_hours(hours, dt = None):
 
 
 ##@aspect.processedby(aspect.tracing_processor)
+@aspect.no_trace
 def add_minutes(minutes, dt = None):
     """Returns dt + minutes
     """
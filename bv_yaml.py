@@ -18,12 +18,23 @@ import zd
 import aspect
 import a
 import bv_file64 as bv_file
-import bv_stack
 import yaml
-import ruamel.yaml
+# libyaml-backed when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+# ruamel.yaml is imported where round trips use it
 import os
+import sys
+import copy
 
 FILE_EXTENSION = 'yml'
+# modules skipped when looking for the file whose default config is used
+_IGNORED_CALLERS = frozenset(('bv_stack', 'bv_yaml', 'aspect'))
+
+# (config_file, round_trip_load) -> ((st_mtime_ns, st_size), d_config)
+_CONFIG_CACHE = {}
 
 class Error (Exception):
     """
@@ -52,22 +63,32 @@ def get_default_config_file():
         str: default config file
 
     """
-    stack = bv_stack.Stack(ignored_files = ('bv_stack', 'bv_yaml','aspect'))
-    caller = stack.get_current_file()
+    # walk the frames directly instead of building a bv_stack.Stack
+    frame = sys._getframe(1)
+    caller = frame.f_code.co_filename
+    while frame is not None:
+        file_name = frame.f_code.co_filename
+        if os.path.splitext(os.path.basename(file_name))[0] not in \
+                _IGNORED_CALLERS:
+            caller = file_name
+            break
+        frame = frame.f_back
     config_file = get_config_file(caller)
     return config_file
 
 
-def write_config_file(data, config_file=None, round_trip_dump=False):
+def write_config_file(data, config_file=None, round_trip_dump=False,
+        reload=False):
     """write_config_file writes data to config_file
 
     Args:
         config_file (str): path file of config file
         data (dict): dictionary of data
         round_trip_dump(bool): if yes, will use ruamel.yaml, else yaml
+        reload(bool): if yes, reads config_file back with load_config
 
     Returns:
-        dict: dict of config_file if successful, None otherwise.
+        dict: data, or dict of config_file if reload
 
     """
     if config_file is None:
@@ -75,32 +96,52 @@ def write_config_file(data, config_file=None, round_trip_dump=False):
 
     with open(config_file, 'w') as outfile:
         if round_trip_dump:
+            import ruamel.yaml
             ruamel.yaml.round_trip_dump(data, outfile)
         else:
-            yaml.dump(data, outfile, default_flow_style=False)
+            yaml.dump(data, outfile, Dumper=SafeDumper,
+                default_flow_style=False)
+
+    if reload:
+        return load_config(config_file, round_trip_dump)
+    return data
 
-    return load_config(config_file, round_trip_dump)
 
 
 
+def invalidate_config_cache():
+    """ forget all configs cached by load_config
+    """
+    _CONFIG_CACHE.clear()
 
 ##@aspect.processedby(aspect.tracing_processor)
 def load_config(config_file = None, round_trip_load=False):
-    """
+    """ Returns the parsed config_file
+
+        the parse is cached until config_file changes; callers get a copy,
+        so they may modify it
     """
     if config_file is None:
         config_file = get_default_config_file()
 
-    if round_trip_load:
-        f = open(config_file, 'r')
-        d_config = ruamel.yaml.round_trip_load(f)
-    else:
-
-        config = open(config_file, 'r')
-        d_config = yaml.load(config, Loader=yaml.FullLoader)
-
+    key = (config_file, round_trip_load)
+    st = os.stat(config_file)
+    signature = (st.st_mtime_ns, st.st_size)
+    cached = _CONFIG_CACHE.get(key)
+    if cached is not None and cached[0] == signature:
+        return copy.deepcopy(cached[1])
+
+    # binary, so the (C) reader decodes the bytes itself; with, so the
+    # file is closed
+    with open(config_file, 'rb') as f:
+        if round_trip_load:
+            import ruamel.yaml
+            d_config = ruamel.yaml.round_trip_load(f)
+        else:
+            d_config = yaml.load(f, Loader=SafeLoader)
 
-    return d_config
+    _CONFIG_CACHE[key] = (signature, d_config)
+    return copy.deepcopy(d_config)
 
 def _test():
     '''Runs all tests
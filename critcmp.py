@@ -2,14 +2,20 @@
 
 import os
 import json
-from bs4 import BeautifulSoup
+import mmap
 import re
 import typer
 from typing import Optional, List
 from pathlib import Path
 from rich.console import Console
 from rich.table import Table
-from rich import print as rprint
+import concurrent.futures
+# BeautifulSoup tree builder: lxml's C parser when installed
+try:
+    import lxml
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
 import subprocess
 import sys
 import time  # Add this import for time tracking
@@ -20,6 +26,18 @@ console = Console()
 # Constants
 DEFAULT_CRITERION_DIR = Path.cwd() / "target" / "criterion"
 
+# Parsed reports cache, kept in <criterion_dir>/report between runs
+CACHE_FILE_NAME = ".critcmp_cache.json"
+
+# Label of the report row holding the change data
+CHANGE_ROW_LABEL = "Change in time"
+
+# Patterns applied to every report row / critcmp output line
+PERCENTAGE_RE = re.compile(r"([+-]?\d+\.\d+)%")
+P_VALUE_RE = re.compile(r"p\s*=\s*(\d+\.\d+)")
+# time values like "33.5±2.43ns"
+TIME_RE = re.compile(r"(\d+\.\d+)±\d+\.\d+(ns|µs|ms|s)")
+
 
 def find_criterion_dir() -> Path:
     """Locate the criterion directory in the user's cargo target directory."""
@@ -30,9 +48,58 @@ def find_criterion_dir() -> Path:
     )
 
 
+def load_json_file(file_path: Path) -> Optional[dict]:
+    """Load a JSON file, or return None if it is missing or unreadable."""
+    try:
+        with open(file_path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"==> Error loading JSON file: {e}")
+        return None
+
+
+def parse_benchmark_estimates(benchmark_dir: Path) -> Optional[dict]:
+    """Read the change estimates Criterion writes as JSON for a benchmark.
+
+    Returns {"name": ..., "data": ...} like parse_benchmark_report, without
+    p-values, or None if the benchmark has no change/estimates.json.
+    """
+    estimates = load_json_file(benchmark_dir / "change" / "estimates.json")
+    if not estimates:
+        return None
+
+    data = {}
+    for statistic in ("mean", "median"):
+        estimate = estimates.get(statistic) or {}
+        if estimate.get("point_estimate") is not None:
+            data[statistic] = {"point_estimate": estimate["point_estimate"]}
+
+    benchmark = load_json_file(benchmark_dir / "new" / "benchmark.json") or {}
+    display_name = benchmark.get("title") or benchmark_dir.name
+    return {"name": display_name, "data": data}
+
+
 def parse_benchmark_report(benchmark_dir: Path) -> dict:
-    """Parse the index.html report file for a benchmark to extract performance data."""
+    """Extract performance data for a benchmark.
+
+    Change estimates are read from Criterion's JSON output when present; the
+    index.html report is then only parsed for the p-value, which Criterion
+    does not write as JSON. Without the JSON, everything comes from the HTML.
+    """
     report_file = benchmark_dir / "report" / "index.html"
+    parsed = parse_benchmark_estimates(benchmark_dir)
+    if parsed is not None:
+        print(f"==> Read JSON estimates for {benchmark_dir.name}: {parsed['data']}")
+        if "mean" in parsed["data"] and report_file.exists():
+            soup = load_html_file(report_file)
+            if soup:
+                p_value = extract_performance_data(soup).get("mean", {}).get("p_value")
+                if p_value is not None:
+                    parsed["data"]["mean"]["p_value"] = p_value
+        return parsed
+
     print(f"==> Checking for file: {report_file}")
     if not report_file.exists():
         print(f"==> File does not exist: {report_file}")
@@ -61,12 +128,72 @@ def parse_benchmark_report(benchmark_dir: Path) -> dict:
         return None
 
 
+def get_report_mtimes(benchmark_dir: Path) -> list:
+    """Return the modification times of the files a benchmark is parsed from (None if missing)."""
+    mtimes = []
+    for file_path in (
+        benchmark_dir / "change" / "estimates.json",
+        benchmark_dir / "new" / "benchmark.json",
+        benchmark_dir / "report" / "index.html",
+    ):
+        try:
+            mtimes.append(os.stat(file_path).st_mtime)
+        except OSError:
+            mtimes.append(None)
+    return mtimes
+
+
+def parse_benchmark_report_cached(benchmark_dir: Path, cache: dict) -> dict:
+    """Return parse_benchmark_report(benchmark_dir), reusing the cached result if its files are unchanged."""
+    key = str(benchmark_dir)
+    mtimes = get_report_mtimes(benchmark_dir)
+    entry = cache.get(key)
+    if entry and entry.get("mtimes") == mtimes:
+        print(f"==> Using cached data for {benchmark_dir.name}")
+        return entry["data"]
+
+    parsed = parse_benchmark_report(benchmark_dir)
+    cache[key] = {"mtimes": mtimes, "data": parsed}
+    return parsed
+
+
+def get_cache_file(criterion_dir: Path) -> Path:
+    """Return the path of the parsed reports cache for criterion_dir."""
+    return criterion_dir / "report" / CACHE_FILE_NAME
+
+
+def save_cache(cache: dict, cache_file: Path):
+    """Write the parsed reports cache; a failure only costs a re-parse next run."""
+    try:
+        cache_file.parent.mkdir(exist_ok=True)
+        with open(cache_file, "w") as f:
+            json.dump(cache, f)
+    except OSError as e:
+        print(f"==> Error saving cache: {e}")
+
+
 def load_html_file(file_path: Path):
-    """Load and parse an HTML file."""
+    """Load and parse an HTML report file.
+
+    Returns None without parsing if the report has no change row, eg on a
+    first (baseline) run.
+    """
+    # imported here, so commands that never parse a report skip it
+    from bs4 import BeautifulSoup
+
     try:
-        with open(file_path, "r") as f:
-            html_content = f.read()
-        return BeautifulSoup(html_content, "html.parser")
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:  # mmap rejects empty files
+                return None
+            # search the raw bytes, so reports without a change row are
+            # never read into a str
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm.find(CHANGE_ROW_LABEL.encode()) == -1:
+                    print(f"==> No '{CHANGE_ROW_LABEL}' row in {file_path}")
+                    return None
+                html_content = mm[:]
+        # Criterion writes its reports as UTF-8
+        return BeautifulSoup(html_content, HTML_PARSER, from_encoding="utf-8")
     except Exception as e:
         print(f"==> Error loading HTML file: {e}")
         return None
@@ -131,7 +258,7 @@ def process_table(table, data: dict):
         if not cells or len(cells) == 0:
             continue
 
-        if "Change in time" in cells[0].text:
+        if CHANGE_ROW_LABEL in cells[0].text:
             print(f"==> Found 'Change in time' row")
             extract_change_data_from_row(cells, data)
 
@@ -157,7 +284,7 @@ def extract_change_data_from_row(cells, data: dict):
 
 def extract_percentage_change(text: str) -> float:
     """Extract percentage change from text."""
-    change_match = re.search(r"([+-]?\d+\.\d+)%", text)
+    change_match = PERCENTAGE_RE.search(text)
     if change_match:
         percentage = float(change_match.group(1))
         print(f"==> Found percentage change: {percentage}%")
@@ -167,10 +294,8 @@ def extract_percentage_change(text: str) -> float:
 
 def extract_p_value(text: str) -> float:
     """Extract p-value from text."""
-    p_value_match = re.search(r"p\s*=\s*(\d+\.\d+)", text)
-    if not p_value_match:  # Try another format for p = 0.00 < 0.05
-        p_value_match = re.search(r"p\s*=\s*(\d+\.\d+)\s*[<>=]", text)
-
+    # also matches the "p = 0.00 < 0.05" format
+    p_value_match = P_VALUE_RE.search(text)
     if p_value_match:
         p_value = float(p_value_match.group(1))
         print(f"==> Found p-value: {p_value}")
@@ -235,7 +360,7 @@ def format_percentage(value: float) -> str:
         return f"[red]+{value:.2f}%[/red]"  # Regression
 
 
-def collect_benchmark_results(benchmark_dirs, threshold, p_value_threshold, use_dirname: bool = False, exclude_list: Optional[List[str]] = None):
+def collect_benchmark_results(benchmark_dirs, threshold, p_value_threshold, use_dirname: bool = False, exclude_list: Optional[List[str]] = None, cache: Optional[dict] = None):
     """Collect and filter benchmark results that meet significance criteria.
 
     Args:
@@ -244,18 +369,36 @@ def collect_benchmark_results(benchmark_dirs, threshold, p_value_threshold, use_
         p_value_threshold: maximum p-value to include
         use_dirname: if True, prefer the filesystem directory name instead of HTML display title
         exclude_list: list of substrings; if any appears in a dir name, that dir will be skipped
+        cache: parsed reports by benchmark dir, see parse_benchmark_report_cached; updated in place
     """
+    # imported here, so commands that never filter results skip it
+    import numpy as np
+
     results = []
     exclude_list = exclude_list or []
 
+    included_dirs = []
     for benchmark_dir in benchmark_dirs:
         # Skip excluded directories by substring
         if any(sub for sub in exclude_list if sub and sub in benchmark_dir.name):
             print(f"==> SKIP (excluded): {benchmark_dir.name}")
             continue
+        included_dirs.append(benchmark_dir)
+
+    # Reports are independent, so parse them concurrently; filtering below
+    # stays on this thread, in benchmark order
+    with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        if cache is None:
+            parsed_reports = list(executor.map(parse_benchmark_report, included_dirs))
+        else:
+            parsed_reports = list(
+                executor.map(lambda d: parse_benchmark_report_cached(d, cache), included_dirs)
+            )
 
+    # Benchmarks with change data, as parallel columns
+    dirs, display_names, mean_pcts, p_values, median_pcts = [], [], [], [], []
+    for benchmark_dir, parsed in zip(included_dirs, parsed_reports):
         print(f"\n==> Processing benchmark: {benchmark_dir.name}")
-        parsed = parse_benchmark_report(benchmark_dir)
         if not parsed or "data" not in parsed:
             print(f"==> No data found for {benchmark_dir.name}")
             continue
@@ -267,39 +410,44 @@ def collect_benchmark_results(benchmark_dirs, threshold, p_value_threshold, use_
             print(f"==> No valid change data for {display_name} ({benchmark_dir.name})")
             continue
 
+        dirs.append(benchmark_dir)
+        display_names.append(display_name)
+        mean_pcts.append(change_data["mean_pct"])
+        p_values.append(change_data["mean_p_value"])
+        median_pcts.append(change_data["median_pct"])
+
+    # Only include changes above threshold AND statistically significant,
+    # tested for all benchmarks at once
+    above_threshold = np.abs(np.array(mean_pcts, dtype=float)) >= threshold
+    significant = np.array(p_values, dtype=float) < p_value_threshold
+    included = above_threshold & significant
+
+    results = []
+    for i, benchmark_dir in enumerate(dirs):
+        display_name = display_names[i]
         print(
-            f"==> Checking threshold for '{display_name}': abs({change_data['mean_pct']:.2f}) >= {threshold} = {abs(change_data['mean_pct']) >= threshold}"
+            f"==> Checking threshold for '{display_name}': abs({mean_pcts[i]:.2f}) >= {threshold} = {above_threshold[i]}"
         )
         print(
-            f"==> Checking p-value for '{display_name}': {change_data['mean_p_value']} < {p_value_threshold} = {change_data['mean_p_value'] < p_value_threshold}"
+            f"==> Checking p-value for '{display_name}': {p_values[i]} < {p_value_threshold} = {significant[i]}"
         )
+        if not included[i]:
+            print(f"==> EXCLUDED: Benchmark '{display_name}' ({benchmark_dir.name}) doesn't meet criteria")
+            continue
 
-        # Only include changes above threshold AND statistically significant
-        if (
-            abs(change_data["mean_pct"]) >= threshold
-            and change_data["mean_p_value"] < p_value_threshold
-        ):
-            # Decide what name to show based on use_dirname flag; still append dir for traceability if different
-            if use_dirname:
-                display_to_show = benchmark_dir.name
-            else:
-                display_to_show = display_name
-
-            # If the HTML display name differs, append directory name in parens for traceability
-            if display_to_show != benchmark_dir.name:
-                display_to_show = f"{display_to_show} ({benchmark_dir.name})"
-
-            print(f"==> INCLUDED: Benchmark '{display_to_show}' meets criteria")
-
-            result = (
-                display_to_show,
-                change_data["mean_pct"],
-                change_data["mean_p_value"],
-                change_data["median_pct"],
-            )
-            results.append(result)
+        # Decide what name to show based on use_dirname flag; still append dir for traceability if different
+        if use_dirname:
+            display_to_show = benchmark_dir.name
         else:
-            print(f"==> EXCLUDED: Benchmark '{display_name}' ({benchmark_dir.name}) doesn't meet criteria")
+            display_to_show = display_name
+
+        # If the HTML display name differs, append directory name in parens for traceability
+        if display_to_show != benchmark_dir.name:
+            display_to_show = f"{display_to_show} ({benchmark_dir.name})"
+
+        print(f"==> INCLUDED: Benchmark '{display_to_show}' meets criteria")
+
+        results.append((display_to_show, mean_pcts[i], p_values[i], median_pcts[i]))
 
     return results
 
@@ -322,7 +470,7 @@ def build_results_table(results, detailed=False):
         p_value = f"{result[2]:.6f}"
         mean_formatted = format_percentage(mean_pct)
 
-        if detailed and len(result) > 3:
+        if detailed:
             median_formatted = format_percentage(result[3])
             table.add_row(benchmark_name, mean_formatted, p_value, median_formatted)
         else:
@@ -336,17 +484,18 @@ def save_results_to_file(results, output_file, p_value_threshold):
     improvements = sum(1 for r in results if r[1] < 0)
     regressions = sum(1 for r in results if r[1] > 0)
 
+    # Build the whole summary, then write it at once
+    lines = [
+        f"Criterion Benchmark Summary (Statistically Significant Changes p < {p_value_threshold})\n\n"
+    ]
+    lines.extend(
+        f"{benchmark_name}: {mean_pct:+.2f}% (p={p_value:.6f})\n"
+        for benchmark_name, mean_pct, p_value, *_ in results
+    )
+    lines.append(f"\nSummary: {improvements} improvements, {regressions} regressions\n")
+
     with open(output_file, "w") as f:
-        f.write(
-            f"Criterion Benchmark Summary (Statistically Significant Changes p < {p_value_threshold})\n\n"
-        )
-        for result in results:
-            benchmark_name = result[0]
-            mean_pct = result[1]
-            p_value = result[2]
-            sign = "-" if mean_pct < 0 else "+"
-            f.write(f"{benchmark_name}: {sign}{abs(mean_pct):.2f}% (p={p_value:.6f})\n")
-        f.write(f"\nSummary: {improvements} improvements, {regressions} regressions\n")
+        f.write("".join(lines))
 
     console.print(f"Results saved to {output_file}")
 
@@ -419,21 +568,19 @@ def analyze(
     # Parse exclude list
     exclude_list = [s.strip() for s in exclude.split(",")] if exclude else []
 
+    # Reuse reports parsed by earlier runs, when their files are unchanged
+    cache_file = get_cache_file(criterion_dir)
+    cache = load_json_file(cache_file) or {}
+
     # Collect and filter benchmark results
     results = collect_benchmark_results(
-        benchmark_dirs, threshold, p_value_threshold, use_dirname=use_dirname, exclude_list=exclude_list
+        benchmark_dirs, threshold, p_value_threshold, use_dirname=use_dirname, exclude_list=exclude_list, cache=cache
     )
+    save_cache(cache, cache_file)
 
-    # Group results into improvements and regressions
-    improvements = [r for r in results if r[1] < 0]  # negative percentage = improvement
-    regressions = [r for r in results if r[1] >= 0]  # positive percentage = regression
-
-    # Sort each group by benchmark name
-    improvements.sort(key=lambda x: x[0])
-    regressions.sort(key=lambda x: x[0])
-
-    # Combine the sorted groups: improvements first, then regressions
-    sorted_results = improvements + regressions
+    # Improvements (negative percentage) first, then regressions, each
+    # group by benchmark name, in a single sort
+    sorted_results = sorted(results, key=lambda x: (x[1] >= 0, x[0]))
 
     # Build and display results table
     table = build_results_table(sorted_results, detailed)
@@ -638,11 +785,8 @@ def parse_critcmp_output(output_text):
 
         benchmark_name = " ".join(parts[:name_end_idx])
 
-        # Try to extract time values - looking for patterns like "33.5±2.43ns"
-        time_pattern = re.compile(r"(\d+\.\d+)±\d+\.\d+(ns|µs|ms|s)")
-
         # Find all time values in the line
-        time_matches = time_pattern.findall(line)
+        time_matches = TIME_RE.findall(line)
         if len(time_matches) < 2:
             print(f"==> Could not find enough time values in: {line}")
             continue
@@ -717,16 +861,16 @@ def save_comparison_to_file(results, output_file, main_branch, feature_branch):
     """Save comparison results to a file."""
     improvements, regressions = calculate_comparison_stats(results)
 
-    with open(output_file, "w") as f:
-        f.write(f"Benchmark Comparison: {main_branch} vs {feature_branch}\n\n")
-
-        for result in results:
-            benchmark_name = result[0]
-            percentage = result[1]
-            sign = "-" if percentage < 0 else "+"
-            f.write(f"{benchmark_name}: {sign}{abs(percentage):.2f}%\n")
+    # Build the whole report, then write it at once
+    lines = [f"Benchmark Comparison: {main_branch} vs {feature_branch}\n\n"]
+    lines.extend(
+        f"{benchmark_name}: {percentage:+.2f}%\n"
+        for benchmark_name, percentage, *_ in results
+    )
+    lines.append(f"\nSummary: {improvements} improvements, {regressions} regressions\n")
 
-        f.write(f"\nSummary: {improvements} improvements, {regressions} regressions\n")
+    with open(output_file, "w") as f:
+        f.write("".join(lines))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,30 @@
+import sys
+from datetime import datetime
+from pathlib import Path as _P
+
+# ensure repo root is importable
+sys.path.insert(0, str(_P(__file__).resolve().parents[1]))
+from alias import _get_last_scheduled_epoch
+
+
+def _epoch(dt):
+    return int(dt.timestamp())
+
+
+def test_last_scheduled_epoch_weekly_fast_path():
+    # Wednesday 2026-10-14 10:00 -> most recent Monday 07:00 is 2026-10-12
+    now = datetime(2026, 10, 14, 10, 0)
+    got = _get_last_scheduled_epoch("0 7 * * 0", now_dt=now, now_epoch=_epoch(now))
+    assert got == _epoch(datetime(2026, 10, 12, 7, 0))
+
+
+def test_last_scheduled_epoch_daily_before_time_uses_yesterday():
+    now = datetime(2026, 10, 14, 6, 59)
+    got = _get_last_scheduled_epoch("0 7 * * *", now_dt=now, now_epoch=_epoch(now))
+    assert got == _epoch(datetime(2026, 10, 13, 7, 0))
+
+
+def test_last_scheduled_epoch_multi_value_fields():
+    now = datetime(2026, 10, 14, 10, 20)
+    got = _get_last_scheduled_epoch("0,30 9-11 * * *", now_dt=now, now_epoch=_epoch(now))
+    assert got == _epoch(datetime(2026, 10, 14, 10, 0))
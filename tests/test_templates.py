@@ -0,0 +1,19 @@
+import sys
+from pathlib import Path as _P
+from string import Template
+
+# ensure repo root is importable
+sys.path.insert(0, str(_P(__file__).resolve().parents[1]))
+from alias import _render_template
+
+
+def test_render_template_matches_safe_substitute():
+    tpl = "Issue: ${url} ($id)\n$$ literal, ${unknown} and $other stay\n${summary}\n"
+    ctx = {"summary": "- bullet", "url": "https://x/1", "id": "1", "timestamp": "now"}
+    assert _render_template(tpl, ctx) == Template(tpl).safe_substitute(**ctx)
+
+
+def test_render_template_reuses_compiled_parts():
+    tpl = "${summary}!"
+    assert _render_template(tpl, {"summary": "a"}) == "a!"
+    assert _render_template(tpl, {"summary": "b"}) == "b!"
@@ -16,6 +16,8 @@ import yaml
 
 import pickle
 import sys
+import atexit
+import threading
 import _base
 import tee
 
@@ -37,6 +39,14 @@ output_to_stdout = False
 
 indent = 0
 
+# lines formatted by f(..., buffered=True) but not logged yet; they are
+# logged, one record each and in call order, by flush(), which f() and
+# warn() call before logging anything directly
+BUFFER_LIMIT = 64 * 1024
+_buffer = []
+_buffer_size = 0
+_buffer_lock = threading.Lock()
+
 _config_file = open(config_file, 'r')
 d_config = yaml.load(_config_file, Loader=yaml.FullLoader)
 logging.config.dictConfig(d_config)
@@ -122,12 +132,33 @@ def p(message, encoding=ENCODING):
         output = output.encode(encoding)
         output_to_stdout_logger(output)
 
-def f(message, this_indent = None, encoding=ENCODING):
+def flush():
+    """ log the lines held by f(..., buffered=True)
+    """
+    global _buffer
+    global _buffer_size
+
+    with _buffer_lock:
+        for line in _buffer:
+            file_logger.debug(line)
+        _buffer = []
+        _buffer_size = 0
+
+atexit.register(flush)
+
+def f(message, this_indent = None, encoding=ENCODING, buffered=False):
+    """ log message at this_indent (default: the current indent)
+
+        if buffered, the line is formatted now but only logged at the next
+        flush(), which happens before any unbuffered f() or warn() and once
+        the held lines exceed BUFFER_LIMIT characters
+    """
     global indent
     global init_log_file
     global debug
     global file_logger
     global simple_stdout_logger
+    global _buffer_size
 
     if not message:
         return
@@ -139,7 +170,18 @@ def f(message, this_indent = None, encoding=ENCODING):
     this_message = get_formatted_message(this_message)
 
     if init_log_file:
-        file_logger.debug(prefixed_message(this_message))
+        this_message = prefixed_message(this_message)
+        if buffered:
+            with _buffer_lock:
+                _buffer.append(this_message)
+                _buffer_size += len(this_message)
+                full = _buffer_size > BUFFER_LIMIT
+            if full:
+                flush()
+        else:
+            if _buffer:
+                flush()
+            file_logger.debug(this_message)
 
     global output_to_stdout
     if output_to_stdout:
@@ -154,6 +196,8 @@ def warn(message):
 
     simple_stdout_logger.warn(prefixed_message(message))
     if init_log_file:
+        if _buffer:
+            flush()
         file_logger.warn(prefixed_message(message))
 
 def dump(object):